@@ -1,15 +1,32 @@
 """ fURI File access through URIs. """
 
 from . import exceptions
+from .furifile import TransferConfig
 from .furimap import chain
+from .pool import close_all
+from .utils import add_copier
 from .utils import add_handler
 from .utils import add_mapper
 from .utils import add_mapext
+from .utils import copy
 from .utils import download
+from .utils import download_many
 from .utils import exists
+from .utils import glob
+from .utils import iglob
 from .utils import map   # pylint: disable=redefined-builtin
 from .utils import open  # pylint: disable=redefined-builtin
 from .utils import walk
+try:
+    from . import aio
+    from .aio import adownload
+    from .aio import aexists
+    from .aio import aglob
+    from .aio import amap
+    from .aio import aopen
+    from .aio import awalk
+except SyntaxError:
+    pass
 try:
     from . import aws
 except ImportError:
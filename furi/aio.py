@@ -0,0 +1,186 @@
+""" fURI asyncio interface.
+
+    Files & mappings are wrapped so that blocking I/O runs on a bounded
+    thread pool instead of the event loop. """
+import asyncio
+from concurrent import futures
+import functools
+import itertools
+import threading
+
+from . import utils
+
+
+__executor__ = None
+__lock__ = threading.Lock()
+
+
+def configure(workers=64):
+    """ Set the number of threads used for blocking I/O.
+
+        Arguments:
+            workers (int):  Maximum concurrent blocking operations """
+    global __executor__  # pylint: disable=global-statement
+    with __lock__:
+        previous, __executor__ = __executor__, \
+            futures.ThreadPoolExecutor(workers, thread_name_prefix='furi')
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+async def run(func, *args, **kwargs):
+    """ Run a blocking function on the fURI thread pool. """
+    if __executor__ is None:
+        configure()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        __executor__, functools.partial(func, *args, **kwargs))
+
+
+async def iterate(iterable, batch=1):
+    """ Iterate over a blocking iterable on the fURI thread pool, pulling up
+        to `batch` items per round trip. """
+    iterator = await run(iter, iterable)
+    while True:
+        items = await run(list, itertools.islice(iterator, batch))
+        for item in items:
+            yield item
+        if len(items) < batch:
+            return
+
+
+async def aopen(uri, **kwargs):
+    """ Returns an AsyncFile given a URI. """
+    return AsyncFile(await run(utils.open, uri, **kwargs))
+
+
+async def amap(uri, **kwargs):
+    """ Returns an AsyncMap given a URI. """
+    return AsyncMap(await run(utils.map, uri, **kwargs))
+
+
+async def aexists(uri, **kwargs):
+    """ Returns True if URI exists. """
+    return await run(utils.exists, uri, **kwargs)
+
+
+async def adownload(source, target=None, **kwargs):
+    """ Download contents of a source URI into a target URI. """
+    return await run(utils.download, source, target, **kwargs)
+
+
+def aglob(uri, **kwargs):
+    """ Asynchronously iterate over URIs matching a wildcard pattern. """
+    return iterate(utils.iglob(uri, **kwargs))
+
+
+def awalk(uri, **kwargs):
+    """ Asynchronously walk a directory given a URI. """
+    return iterate(utils.walk(uri, **kwargs))
+
+
+class AsyncFile(object):
+    """ Asynchronous wrapper around a File. Lines are read on the thread
+        pool in batches of __batchsize__. """
+
+    __batchsize__ = 1024
+
+    def __init__(self, furifile):
+        self.file = furifile
+
+    def __str__(self):
+        return str(self.file)
+
+    def __repr__(self):
+        return "<%s: %s>" % (type(self).__name__, self.file)
+
+    def __aiter__(self):
+        return self.iterlines()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await run(self.file.__exit__, *args)
+
+    async def close(self):
+        """ Close stream. """
+        return await run(self.file.close)
+
+    async def download(self, target, **kwargs):
+        """ Download remote file to local target URI. """
+        return await run(self.file.download, target, **kwargs)
+
+    async def exists(self):
+        """ Test file existence. """
+        return await run(self.file.exists)
+
+    def glob(self, pattern):
+        """ Asynchronously iterate over URIs matching pattern. """
+        return iterate(self.file.glob(pattern))
+
+    async def iterlines(self, chunksize=None, encoding=None,
+                        errors='strict'):
+        """ Asynchronously iterate over lines, reading the stream in bounded
+            chunks. """
+        lines = await run(self.file.iterlines, chunksize, encoding, errors)
+        async for line in iterate(lines, batch=self.__batchsize__):
+            yield line
+
+    async def read(self, *size):
+        """ Read file stream. """
+        return await run(self.file.read, *size)
+
+    async def stat(self, refresh=False):
+        """ Get file metadata. """
+        return await run(self.file.stat, refresh=refresh)
+
+    def walk(self, **kwargs):
+        """ Asynchronously walk the contents of a directory. """
+        return iterate(self.file.walk(**kwargs))
+
+    async def write(self, stream):
+        """ Write stream. """
+        return await run(self.file.write, stream)
+
+
+class AsyncMap(object):
+    """ Asynchronous wrapper around a Mapping. Lookups are awaitable, ex.
+        `await amap['key']`. """
+
+    def __init__(self, mapping):
+        self.map = mapping
+
+    def __str__(self):
+        return str(self.map)
+
+    def __repr__(self):
+        return "<%s: %s>" % (type(self).__name__, self.map)
+
+    def __aiter__(self):
+        return iterate(self.map)
+
+    def __getitem__(self, key):
+        return run(self.map.__getitem__, key)
+
+    async def get(self, key, default=None):
+        """ Get key, or default if it is missing. """
+        try:
+            return await self[key]
+        except KeyError:
+            return default
+
+    async def get_many(self, keys, **kwargs):
+        """ Get many keys, using the mapping's batch lookup if it has one. """
+        keys = list(keys)
+        try:
+            get_many = self.map.get_many
+        except AttributeError:
+            values = await asyncio.gather(*[self.get(x) for x in keys])
+            return dict((k, v) for k, v in zip(keys, values) if v is not None)
+        return await run(get_many, keys, **kwargs)
+
+    async def length(self):
+        """ Number of items. """
+        return await run(len, self.map)
+
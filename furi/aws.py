@@ -3,20 +3,246 @@ try:
     from collections import abc as collections
 except ImportError:
     import collections
+import calendar
+from collections import OrderedDict
+from concurrent import futures
+import hashlib
+import io
 import os
-import re
+import random
+import threading
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 import boto3
+import boto3.s3.transfer
 import botocore
+from . import cache
+from . import exceptions
 from . import furifile
 from . import utils
 
 
+class S3Reader(furifile.RemoteReader):
+    """ Seekable reader over an S3 object built on ranged GETs.
+
+        The object is read in blocks of `blocksize` bytes that are kept in an
+        LRU cache of at most `maxblocks` blocks. Sequential reads fetch
+        `readahead` extra blocks with each request; random reads only fetch
+        the blocks they touch. """
+
+    def __init__(self, client, bucket, key, blocksize=1024 * 1024,
+                 maxblocks=16, readahead=4, size=None):
+        super(S3Reader, self).__init__()
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.blocksize = blocksize
+        self.maxblocks = max(maxblocks, 1)
+        self.readahead = min(readahead, self.maxblocks - 1)
+        self.__blocks__ = OrderedDict()
+        self.__last__ = None
+        self.__size__ = size
+
+    @property
+    def size(self):
+        """ Object size in bytes. """
+        if self.__size__ is None:
+            head = self.client.head_object(Bucket=self.bucket, Key=self.key)
+            self.__size__ = head['ContentLength']
+        return self.__size__
+
+    def readall(self):
+        """ Read from the current position to the end in a single GET. """
+        if self.__pos__ >= self.size:
+            return b''
+        data = self._get(self.__pos__, self.size - 1)
+        self.__pos__ = self.size
+        return data
+
+    def readinto(self, buffer):
+        pos = self.__pos__
+        size = min(len(buffer), self.size - pos)
+        if size <= 0:
+            return 0
+        view = memoryview(buffer).cast('B')
+        first = pos // self.blocksize
+        last = (pos + size - 1) // self.blocksize
+
+        # Reads wider than the cache bypass it
+        if last - first + 1 > self.maxblocks:
+            view[:size] = self._get(pos, pos + size - 1)
+        else:
+            self._fetch(first, last)
+            offset = 0
+            for index in range(first, last + 1):
+                block = self.__blocks__[index]
+                self.__blocks__.move_to_end(index)
+                start = pos + offset - index * self.blocksize
+                chunk = block[start:start + size - offset]
+                view[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+            self.__last__ = last
+        self.__pos__ = pos + size
+        return size
+
+    def _fetch(self, first, last):
+        """ Ensure blocks first..last are cached. """
+        missing = [x for x in range(first, last + 1) if x not in self.__blocks__]
+        if not missing:
+            return
+        if self.__last__ is not None and first in (self.__last__,
+                                                   self.__last__ + 1):
+            # Read ahead no further than the cache can hold alongside the
+            # blocks being read
+            final = (self.size - 1) // self.blocksize
+            last = min(last + self.readahead, final,
+                       first + self.maxblocks - 1)
+            missing += [x for x in range(missing[-1] + 1, last + 1)
+                        if x not in self.__blocks__]
+        start = missing[0] * self.blocksize
+        end = min((missing[-1] + 1) * self.blocksize, self.size) - 1
+        data = self._get(start, end)
+        for index in range(missing[0], missing[-1] + 1):
+            offset = index * self.blocksize - start
+            self.__blocks__[index] = data[offset:offset + self.blocksize]
+        for index in range(first, last + 1):
+            if index in self.__blocks__:
+                self.__blocks__.move_to_end(index)
+        while len(self.__blocks__) > self.maxblocks:
+            self.__blocks__.popitem(last=False)
+
+    def _get(self, start, end):
+        """ GET bytes start..end (inclusive). """
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=self.key, Range='bytes=%d-%d' % (start, end))
+        return response['Body'].read()
+
+
+class S3Writer(furifile.RemoteWriter):
+    """ Write-only stream uploading to S3 through multipart upload.
+
+        Writes are buffered into parts of `partsize` bytes that are uploaded
+        by a pool of `concurrency` threads; at most `concurrency` parts are
+        held in memory at once. Objects smaller than one part are sent with
+        a single PUT. Closing the writer completes the upload and any failure
+        aborts it. S3 requires parts of at least 5MB. """
+
+    __partmin__ = 5 * 1024 ** 2
+
+    def __init__(self, client, bucket, key, partsize=8 * 1024 * 1024,
+                 concurrency=4):
+        _partsize(partsize)
+        super(S3Writer, self).__init__()
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.partsize = partsize
+        self.concurrency = max(concurrency, 1)
+        self.__buffer__ = bytearray()
+        self.__parts__ = []
+        self.__pool__ = None
+        self.__upload__ = None
+
+    def _write(self, data):
+        """ Buffer data, uploading each full part. """
+        self.__buffer__.extend(data)
+        while len(self.__buffer__) >= self.partsize:
+            part = bytes(self.__buffer__[:self.partsize])
+            del self.__buffer__[:self.partsize]
+            self._upload(part)
+
+    def _commit(self):
+        """ PUT small objects or complete the multipart upload. """
+        if self.__upload__ is None:
+            self.client.put_object(
+                Bucket=self.bucket, Key=self.key,
+                Body=bytes(self.__buffer__))
+        else:
+            if self.__buffer__:
+                self._upload(bytes(self.__buffer__))
+            parts = [x.result() for x in self.__parts__]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key,
+                UploadId=self.__upload__,
+                MultipartUpload={'Parts': parts})
+        self._shutdown()
+
+    def _abort(self):
+        """ Abort the multipart upload and discard buffered data. """
+        for future in self.__parts__:
+            future.cancel()
+        self._shutdown()
+        self.__buffer__ = bytearray()
+        if self.__upload__ is not None:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.__upload__)
+
+    def _shutdown(self):
+        """ Stop the upload thread pool. """
+        if self.__pool__ is not None:
+            self.__pool__.shutdown(wait=True)
+            self.__pool__ = None
+
+    def _upload(self, part):
+        """ Submit part for upload, waiting while too many are in flight. """
+        if self.__upload__ is None:
+            self.__upload__ = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key)['UploadId']
+            self.__pool__ = futures.ThreadPoolExecutor(self.concurrency)
+        pending = [x for x in self.__parts__ if not x.done()]
+        if len(pending) >= self.concurrency:
+            futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+        for future in self.__parts__:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+        number = len(self.__parts__) + 1
+        self.__parts__.append(
+            self.__pool__.submit(self._upload_part, number, part))
+
+    def _upload_part(self, number, part):
+        """ Upload a single part. """
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.__upload__,
+            PartNumber=number, Body=part)
+        return {'ETag': response['ETag'], 'PartNumber': number}
+
+
 # pylint: disable=too-few-public-methods
 class S3File(furifile.RemoteFile):
     """ S3-backed file implementation.
 
-        Ex. s3://bucket/path/to/key """
+        Ex. s3://bucket/path/to/key
+
+        Reads are served by a seekable S3Reader; `blocksize`, `maxblocks` and
+        `readahead` tune its block cache. Writes stream through an S3Writer;
+        `partsize` and `concurrency` tune the multipart upload. In 'w' mode
+        successive write() calls append to one upload that is completed when
+        the file is closed. """
+
+    __copymax__ = 5 * 1024 ** 3
+    __decode__ = False
+    __partmin__ = S3Writer.__partmin__
+
+    def __init__(self, uri, mode='r', blocksize=1024 * 1024, maxblocks=16,
+                 readahead=4, partsize=8 * 1024 * 1024, concurrency=4,
+                 **connectkw):
+        _partsize(partsize)
+        super(S3File, self).__init__(uri, mode=mode, **connectkw)
+        self.blocksize = blocksize
+        self.maxblocks = maxblocks
+        self.readahead = readahead
+        self.partsize = partsize
+        self.concurrency = concurrency
+        self.__key__ = None
+
+    def __exit__(self, *args):
+        if args[0] is not None and isinstance(self.__stream__, S3Writer):
+            self.__stream__.abort()
+        super(S3File, self).__exit__(*args)
 
     @property
     def bucket(self):
@@ -26,8 +252,10 @@ class S3File(furifile.RemoteFile):
     @property
     def key(self):
         """ Remote key. """
-        return self.connection.Object(
-            self.uri.netloc, self.uri.path.lstrip('/'))
+        if self.__key__ is None:
+            self.__key__ = self.connection.Object(
+                self.uri.netloc, self.uri.path.lstrip('/'))
+        return self.__key__
 
     def _connect(self):
         # Support boto-style access/secret keys
@@ -43,63 +271,203 @@ class S3File(furifile.RemoteFile):
         # Connect to AWS
         return boto3.resource('s3', **self.__connect__)
 
-    def _download(self, target):
+    def _disconnect(self, connection):
+        """ Close a pooled connection. """
+        connection.meta.client.close()
+
+    def _host(self):
+        """ S3 connections serve every bucket; key on the endpoint only. """
+        return self.__connect__.get('endpoint_url')
+
+    def _download(self, target, config=None, callback=None):
         """ Download remote file to local target URI. """
-        self.key.download_file(str(target))
+        config = config or furifile.TransferConfig()
+        self.connection.meta.client.download_file(
+            self.uri.netloc,
+            self.uri.path.lstrip('/'),
+            target.path,
+            Callback=callback,
+            Config=boto3.s3.transfer.TransferConfig(
+                multipart_threshold=config.chunksize,
+                multipart_chunksize=config.chunksize,
+                max_concurrency=config.concurrency,
+                use_threads=config.threads))
         return target
 
-    def _exists(self):
-        """ Test file existence. """
+    def _fetchstat(self):
+        """ Metadata from a single HEAD request. """
         try:
-            self.key.load()
+            head = self.connection.meta.client.head_object(
+                Bucket=self.uri.netloc, Key=self.uri.path.lstrip('/'))
         except botocore.exceptions.ClientError as err:
             if err.response['Error']['Code'] == "404":
-                return False
+                return None
+            raise err
+        return self._makestat(head)
+
+    @staticmethod
+    def _makestat(response):
+        """ Build Stat from HEAD or GET response metadata. """
+        return furifile.Stat(
+            response['ContentLength'],
+            calendar.timegm(response['LastModified'].utctimetuple()),
+            response['ETag'],
+            response.get('ContentType'))
+
+    def _synced(self, target):
+        """ Compare target size & MD5 with the remote object. Multipart ETags
+            are not MD5 digests, so those fall back to size & mtime. """
+        if not self.exists():
+            return False
+        remote = self.stat()
+        local = os.stat(target.path)
+        if local.st_size != remote.size:
+            return False
+        etag = remote.etag.strip('"')
+        if '-' in etag:
+            return local.st_mtime >= remote.mtime
+        digest = hashlib.md5()
+        with open(target.path, 'rb') as local:
+            for chunk in iter(lambda: local.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest() == etag
+
+    def _read_changed(self, tag=None, buffer=False):
+        """ Read-if-changed implementation. Revalidates with a conditional GET
+            on the ETag so unchanged objects transfer no body. """
+        kwargs = {} if tag is None else {'IfNoneMatch': tag}
+        try:
+            response = self.key.get(**kwargs)
+        except botocore.exceptions.ClientError as err:
+            code = err.response['Error']['Code']
+            if code in ('304', 'NotModified'):
+                return tag, None
+            if code in ('404', 'NoSuchKey'):
+                raise exceptions.FuriFileNotFoundError(
+                    "%s does not exist" % self.uri.geturl())
             raise err
-        return True
+        self.__stat__ = (self._makestat(response),)
+        body = response['Body'].read()
+        return response['ETag'], memoryview(body) if buffer else body
+
+    def _close(self):
+        """ Close stream, completing any pending upload. """
+        if isinstance(self.__stream__, S3Writer):
+            writer, self.__stream__ = self.__stream__, None
+            return writer.close()
+        return super(S3File, self)._close()
 
     def _write(self, stream):
         """ Write stream to file. """
+        if 'w' in self.mode:
+            return self._copy(stream, self.stream())
+        writer = self._writer()
         try:
-            return self.key.put(Body=stream.read())
-        except AttributeError:
-            return self.key.put(Body=stream)
+            self._copy(stream, writer)
+        except Exception:
+            writer.abort()
+            raise
+        return writer.close()
+
+    def _copy(self, stream, writer):
+        """ Copy a string or stream into writer one part at a time. """
+        if not hasattr(stream, 'read'):
+            return writer.write(stream)
+        size = 0
+        while True:
+            chunk = stream.read(self.partsize)
+            if not chunk:
+                return size
+            size += writer.write(chunk)
+
+    def _writer(self):
+        """ Get a new S3Writer for this key. """
+        return S3Writer(
+            self.connection.meta.client,
+            self.uri.netloc,
+            self.uri.path.lstrip('/'),
+            partsize=self.partsize,
+            concurrency=self.concurrency)
 
     def _stream(self):
         """ Implementation of stream(). """
-        return self.key.get().get('Body')
-
-    def _walk(self, **kwargs):
-        """ Implementation of walk(). """
-        root = str(re.sub('^/', '', self.uri.path))
-        tree = {root: {'dirnames': set(), 'filenames': set()}}
-        for key in self.bucket.objects.filter(Prefix=self.key.key):
-            rel, filename = [str(x) for x in os.path.split(
-                re.split("^%s" % root, key.key)[-1])]
-            history = root
-            for subdir in rel.split('/'):
-                if subdir:
-                    tree[history]['dirnames'].add(subdir)
-                history = os.path.normpath(os.path.join(history, subdir)) + '/'
-                if history not in tree:
-                    tree[history] = {'dirnames': set(), 'filenames': set()}
-            if filename:
-                tree[history]['filenames'].add(filename)
-
-        for dirpath in sorted(tree):
-            dirdata = tree[dirpath]
-            dirnames = sorted(dirdata['dirnames'])
-            filenames = sorted(dirdata['filenames'])
-            dirpath = "s3://%s/%s" % (self.bucket.name, dirpath)
-            yield dirpath, dirnames, filenames
+        if 'w' in self.mode:
+            return self._writer()
+        return io.BufferedReader(S3Reader(
+            self.connection.meta.client,
+            self.uri.netloc,
+            self.uri.path.lstrip('/'),
+            blocksize=self.blocksize,
+            maxblocks=self.maxblocks,
+            readahead=self.readahead,
+            size=self.stat().size))
+
+    def _listdir(self, dirpath, prefix=''):
+        """ List the subdirectories & files directly under a key prefix whose
+            names start with prefix. """
+        dirpath = dirpath.lstrip('/')
+        paginator = self.connection.meta.client.get_paginator(
+            'list_objects_v2')
+        dirnames, filenames = [], []
+        pages = paginator.paginate(
+            Bucket=self.uri.netloc, Prefix=dirpath + prefix, Delimiter='/')
+        for page in pages:
+            for common in page.get('CommonPrefixes') or []:
+                dirnames.append(common['Prefix'][len(dirpath):].rstrip('/'))
+            for obj in page.get('Contents') or []:
+                filename = obj['Key'][len(dirpath):]
+                if filename:
+                    filenames.append(filename)
+        return dirnames, filenames
+
+    def _walk(self, workers=1, **kwargs):
+        """ Implementation of walk(). Lists one directory at a time using
+            delimited listings; with `workers` > 1 sibling directories are
+            listed concurrently ahead of being yielded. """
+        root = self.uri.path.lstrip('/')
+        if root and not root.endswith('/'):
+            root += '/'
+        tree = self._walktree(root, self._listdir,
+                              lambda x, y: "%s%s/" % (x, y), workers)
+        for dirpath, dirnames, filenames in tree:
+            yield "s3://%s/%s" % (self.uri.netloc, dirpath), \
+                dirnames, filenames
 
 
 class DynamoMap(collections.Iterable):
-    """ DynamoDB-backed mappings. """
-    def __init__(self, uri, **connectkw):
+    """ DynamoDB-backed mappings.
+
+        Iteration scans the table; with `segments` > 1 it runs a parallel
+        scan of that many segments.
+
+        With `cachesize` > 0 lookups are served from an in-process LRU cache
+        of that many items that expire after `cachettl` seconds. Missing keys
+        are cached too. Writes through this map invalidate cached keys.
+
+        `count` selects how len() is computed: 'approximate' reads the item
+        count DynamoDB refreshes about every six hours, 'exact' runs a
+        (parallel) Select='COUNT' scan and 'cached' re-uses an exact count
+        for `countttl` seconds. """
+
+    __batchsize__ = 100
+    __counts__ = ('approximate', 'exact', 'cached')
+    __retries__ = 8
+
+    def __init__(self, uri, segments=1, cachesize=0, cachettl=60,
+                 count='approximate', countttl=300, **connectkw):
+        if count not in self.__counts__:
+            raise ValueError("Unsupported count strategy: '%s'" % count)
         self.uri = utils.urlparse(uri)
         self.connection = boto3.resource('dynamodb', **connectkw)
         self.table = self.connection.Table(self.uri.netloc)
+        self.segments = segments
+        self.cache = None
+        if cachesize > 0:
+            self.cache = cache.LRUCache(cachesize, cachettl)
+        self.strategy = count
+        self.countttl = countttl
+        self.__count__ = None
+        self.__keyname__ = None
 
     def __str__(self):
         return self.uri.geturl()
@@ -108,34 +476,289 @@ class DynamoMap(collections.Iterable):
         return "<%s: %s>" % (type(self).__name__, self.uri.geturl())
 
     def __getitem__(self, key):
+        if self.cache is not None:
+            hit, item = self.cache.get(key)
+            if hit and item is None:
+                raise KeyError(key)
+            elif hit:
+                return dict(item)
         try:
-            ikey = {self.table.key_schema[0]['AttributeName']: key}
-            return self._read(self.table.get_item(Key=ikey))['Item']
+            ikey = {self.keyname: key}
+            item = self._read(self.table.get_item(Key=ikey))['Item']
         except KeyError:
+            self._cache(key, None)
             raise KeyError(key)
+        self._cache(key, item)
+        return dict(item)
 
     def __iter__(self):
-        response = self.table.scan()
-        items = response.get('Items') or []
-        for item in items:
-            yield item
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(
-                ExclusiveStartKey=response['LastEvaluatedKey'])
-            items = response.get('Items') or []
-            for item in items:
-                yield item
+        return self.scan()
 
     def __len__(self):
-        return self.table.item_count
+        return self.count()
 
     def __setitem__(self, key, value):
-        origin = self[key].get('Item', key).items()
-        update = value.items()
-        return self.table.put_item(Item=dict(origin + update))
+        """ Merge value into the item at key in a single UpdateItem. """
+        try:
+            return self._update(key, value)
+        finally:
+            self.invalidate(key)
 
     def __delitem__(self, key):
-        self.table.delete_item(Key=key)
+        try:
+            self.table.delete_item(Key={self.keyname: key})
+        finally:
+            self.invalidate(key)
+
+    @property
+    def keyname(self):
+        """ Partition key attribute name. """
+        if self.__keyname__ is None:
+            self.__keyname__ = self.table.key_schema[0]['AttributeName']
+        return self.__keyname__
+
+    def batch(self, workers=1):
+        """ Buffer puts & deletes into BatchWriteItem requests.
+
+            Arguments:
+                workers (int):  Number of batches written concurrently
+
+            Returns:
+                DynamoBatch context manager, flushed on exit. """
+        return DynamoBatch(self, workers=workers)
+
+    def count(self, strategy=None):
+        """ Count table items.
+
+            Arguments:
+                strategy (str):  'approximate', 'exact' or 'cached'
+                                 (defaults to the map's strategy)
+
+            Returns:
+                Number of items. """
+        strategy = strategy or self.strategy
+        if strategy == 'approximate':
+            return self.connection.meta.client.describe_table(
+                TableName=self.table.name)['Table']['ItemCount']
+        if strategy == 'exact':
+            return self._count()
+        if strategy == 'cached':
+            now = time.time()
+            if self.__count__ is None or now - self.__count__[1] > \
+                    self.countttl:
+                self.__count__ = (self._count(), now)
+            return self.__count__[0]
+        raise ValueError("Unsupported count strategy: '%s'" % strategy)
+
+    def get_many(self, keys, projection=None, workers=4):
+        """ Get many items using BatchGetItem.
+
+            Arguments:
+                keys       (iterable):  Partition key values
+                projection (list):      Attribute names to fetch (optional)
+                workers    (int):       Number of batches requested
+                                        concurrently
+
+            Returns:
+                Dict of key to item for each key that exists. """
+        keyname = self.keyname
+        keys = list(OrderedDict.fromkeys(keys))
+        items = {}
+        if self.cache is not None and not projection:
+            for key in list(keys):
+                hit, item = self.cache.get(key)
+                if hit and item is not None:
+                    items[key] = dict(item)
+                if hit:
+                    keys.remove(key)
+        batches = [keys[i:i + self.__batchsize__]
+                   for i in range(0, len(keys), self.__batchsize__)]
+        fetched = {}
+        with futures.ThreadPoolExecutor(max(workers, 1)) as pool:
+            for batch in pool.map(
+                    lambda x: self._batch_get(x, projection), batches):
+                for item in batch:
+                    fetched[item[keyname]] = item
+        if not projection:
+            for key in keys:
+                self._cache(key, fetched.get(key))
+        items.update(fetched)
+        return items
+
+    def invalidate(self, key=None):
+        """ Drop key, or every key if omitted, from the local cache. """
+        if self.cache is not None and key is None:
+            self.cache.clear()
+        elif self.cache is not None:
+            self.cache.invalidate(key)
+
+    def scan(self, segments=None, projection=None, limit=None,
+             queuesize=None):
+        """ Iterate over table items.
+
+            Arguments:
+                segments   (int):   Number of parallel scan segments
+                                    (defaults to self.segments)
+                projection (list):  Attribute names to fetch (optional)
+                limit      (int):   Maximum items per page (optional)
+                queuesize  (int):   Pages buffered ahead of the consumer in
+                                    a parallel scan (defaults to twice the
+                                    number of segments)
+
+            Returns:
+                Generator of items. """
+        segments = segments or self.segments
+        scankw = {}
+        if projection:
+            names = dict(('#p%d' % i, x) for i, x in enumerate(projection))
+            scankw['ProjectionExpression'] = ', '.join(sorted(names))
+            scankw['ExpressionAttributeNames'] = names
+        if limit:
+            scankw['Limit'] = limit
+        if segments <= 1:
+            for page in self._scan_pages(**scankw):
+                for item in page.get('Items') or []:
+                    yield item
+            return
+
+        pages = queue.Queue(maxsize=queuesize or 2 * segments)
+        stop = threading.Event()
+
+        def put(page):
+            """ Queue page unless the consumer has gone away. """
+            while not stop.is_set():
+                try:
+                    return pages.put(page, timeout=0.1)
+                except queue.Full:
+                    pass
+
+        def worker(segment):
+            """ Scan one segment into the queue. """
+            try:
+                for page in self._scan_pages(
+                        Segment=segment, TotalSegments=segments, **scankw):
+                    put(page)
+                    if stop.is_set():
+                        return
+            except Exception as err:  # pylint: disable=broad-except
+                put(err)
+            finally:
+                put(None)
+
+        threads = [threading.Thread(target=worker, args=(x,))
+                   for x in range(segments)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        try:
+            finished = 0
+            while finished < segments:
+                page = pages.get()
+                if page is None:
+                    finished += 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    for item in page.get('Items') or []:
+                        yield item
+        finally:
+            stop.set()
+
+    def keys(self, segments=None):
+        """ Iterate over partition key values.
+
+            Arguments:
+                segments (int):  Number of parallel scan segments
+                                 (defaults to self.segments)
+
+            Returns:
+                Generator of keys. """
+        for item in self.scan(segments=segments, projection=[self.keyname]):
+            yield item[self.keyname]
+
+    def update_many(self, mapping, workers=4):
+        """ Put many items using BatchWriteItem. Unlike __setitem__, each
+            value replaces the stored item rather than merging into it.
+
+            Arguments:
+                mapping (dict):  Mapping of partition key value to item
+                workers (int):   Number of batches written concurrently """
+        with self.batch(workers=workers) as batch:
+            for key, value in mapping.items():
+                batch[key] = value
+
+    def _batch_get(self, keys, projection=None):
+        """ Get a single batch, retrying unprocessed keys with backoff. """
+        request = {'Keys': [{self.keyname: x} for x in keys]}
+        if projection:
+            names = OrderedDict(
+                ('#p%d' % i, x) for i, x in enumerate(
+                    OrderedDict.fromkeys([self.keyname] + list(projection))))
+            request['ProjectionExpression'] = ', '.join(names)
+            request['ExpressionAttributeNames'] = dict(names)
+        items = []
+        responses = self._batch_request(
+            self.connection.meta.client.batch_get_item,
+            {self.table.name: request},
+            'UnprocessedKeys')
+        for response in responses:
+            items.extend(response['Responses'].get(self.table.name, []))
+        return items
+
+    def _batch_request(self, method, items, unprocessed):
+        """ Send a batch request, retrying unprocessed items with jittered
+            exponential backoff.
+
+            Arguments:
+                method      (func):  Client batch method
+                items       (dict):  RequestItems
+                unprocessed (str):   Response key of unprocessed items
+
+            Returns:
+                List of responses. """
+        responses = []
+        for attempt in range(self.__retries__ + 1):
+            if attempt:
+                time.sleep(random.uniform(0, min(0.05 * 2 ** attempt, 5)))
+            response = method(RequestItems=items)
+            responses.append(response)
+            items = response.get(unprocessed)
+            if not items:
+                return responses
+        raise ValueError(
+            "%s: unprocessed items after %d retries" % (self, self.__retries__))
+
+    def _batch_write(self, requests):
+        """ Write a single batch, retrying unprocessed items with backoff. """
+        responses = self._batch_request(
+            self.connection.meta.client.batch_write_item,
+            {self.table.name: requests},
+            'UnprocessedItems')
+        for request in requests:
+            if 'PutRequest' in request:
+                self.invalidate(request['PutRequest']['Item'][self.keyname])
+            else:
+                self.invalidate(request['DeleteRequest']['Key'][self.keyname])
+        return responses
+
+    def _cache(self, key, item):
+        """ Cache item (or None for a missing key) if caching is enabled. """
+        if self.cache is not None:
+            self.cache.set(key, item)
+
+    def _count(self):
+        """ Exact count from a Select='COUNT' scan of no item payloads. """
+        segments = max(self.segments, 1)
+
+        def count(segment):
+            """ Count one segment. """
+            scankw = {'Select': 'COUNT'}
+            if segments > 1:
+                scankw.update(Segment=segment, TotalSegments=segments)
+            return sum(x['Count'] for x in self._scan_pages(**scankw))
+
+        with futures.ThreadPoolExecutor(segments) as pool:
+            return sum(pool.map(count, range(segments)))
 
     def _read(self, results=None):
         """ Read Dynamo result and throw ValueError on non-200 response code.
@@ -147,6 +770,158 @@ class DynamoMap(collections.Iterable):
             raise ValueError(response)
         return results
 
+    def _scan_pages(self, **scankw):
+        """ Iterate over scan response pages. """
+        client = self.connection.meta.client
+        response = client.scan(TableName=self.table.name, **scankw)
+        yield response
+        while 'LastEvaluatedKey' in response:
+            response = client.scan(
+                TableName=self.table.name,
+                ExclusiveStartKey=response['LastEvaluatedKey'],
+                **scankw)
+            yield response
+
+    def _update(self, key, value):
+        """ Merge value into item at key. """
+        value = dict((k, v) for k, v in value.items() if k != self.keyname)
+        if not value:
+            try:
+                return self.table.put_item(
+                    Item={self.keyname: key},
+                    ConditionExpression='attribute_not_exists(#k)',
+                    ExpressionAttributeNames={'#k': self.keyname})
+            except botocore.exceptions.ClientError as err:
+                code = err.response['Error']['Code']
+                if code != 'ConditionalCheckFailedException':
+                    raise err
+                return None
+        names, values, updates = {}, {}, []
+        for index, (attr, val) in enumerate(value.items()):
+            names['#a%d' % index] = attr
+            values[':v%d' % index] = val
+            updates.append('#a%d = :v%d' % (index, index))
+        return self.table.update_item(
+            Key={self.keyname: key},
+            UpdateExpression='SET %s' % ', '.join(updates),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values)
+
+
+class DynamoBatch(object):
+    """ Buffered writer for a DynamoMap.
+
+        Puts & deletes are buffered and sent in BatchWriteItem requests of 25
+        items; with `workers` > 1 batches are written concurrently. A later
+        write to a key replaces any buffered write to the same key. Buffered
+        writes are flushed when the context exits without error. """
+
+    __batchsize__ = 25
+
+    def __init__(self, dynamomap, workers=1):
+        self.map = dynamomap
+        self.workers = max(workers, 1)
+        self.__buffer__ = OrderedDict()
+        self.__pending__ = []
+        self.__pool__ = None
+        if self.workers > 1:
+            self.__pool__ = futures.ThreadPoolExecutor(self.workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        try:
+            if args[0] is None:
+                self.flush()
+        finally:
+            if self.__pool__ is not None:
+                self.__pool__.shutdown(wait=True)
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def put(self, key, value):
+        """ Buffer a put of value at key. """
+        item = dict(value)
+        item[self.map.keyname] = key
+        self._buffer(key, {'PutRequest': {'Item': item}})
+
+    def delete(self, key):
+        """ Buffer a delete of key. """
+        self._buffer(
+            key, {'DeleteRequest': {'Key': {self.map.keyname: key}}})
+
+    def flush(self):
+        """ Write all buffered items and wait for pending batches. """
+        while self.__buffer__:
+            self._send()
+        pending, self.__pending__ = self.__pending__, []
+        for future, _ in pending:
+            future.result()
+
+    def _buffer(self, key, request):
+        """ Add request to buffer, sending a batch when full. """
+        self.__buffer__.pop(key, None)
+        self.__buffer__[key] = request
+        if len(self.__buffer__) >= self.__batchsize__:
+            self._send()
+
+    def _send(self):
+        """ Send one batch from the buffer. Batches holding an earlier write
+            to any of the same keys are waited on first, so concurrent
+            batches never reorder writes to a key. """
+        keys, requests = set(), []
+        while self.__buffer__ and len(requests) < self.__batchsize__:
+            key, request = self.__buffer__.popitem(last=False)
+            keys.add(key)
+            requests.append(request)
+        if self.__pool__ is None:
+            self.map._batch_write(requests)  # pylint: disable=protected-access
+            return
+        conflicts = [x for x, y in self.__pending__ if y & keys]
+        if len(self.__pending__) >= 2 * self.workers:
+            conflicts.append(self.__pending__[0][0])
+        if conflicts:
+            futures.wait(conflicts)
+        for future, _ in self.__pending__:
+            if future.done():
+                future.result()
+        self.__pending__ = [x for x in self.__pending__ if not x[0].done()]
+        self.__pending__.append(
+            (self.__pool__.submit(
+                self.map._batch_write,  # pylint: disable=protected-access
+                requests), keys))
+
+
+def _copy_s3(src, tgt, config, callback):
+    """ Server-side copy between S3 objects. Objects up to 5GB are copied
+        with a single CopyObject, larger ones with concurrent UploadPartCopy
+        parts of at least config.chunksize bytes. """
+    tgt.connection.meta.client.copy(
+        {'Bucket': src.uri.netloc, 'Key': src.uri.path.lstrip('/')},
+        tgt.uri.netloc,
+        tgt.uri.path.lstrip('/'),
+        Callback=callback,
+        SourceClient=src.connection.meta.client,
+        Config=boto3.s3.transfer.TransferConfig(
+            multipart_threshold=S3File.__copymax__,
+            multipart_chunksize=max(config.chunksize, S3File.__partmin__),
+            max_concurrency=config.concurrency,
+            use_threads=config.threads))
+    tgt.__stat__ = None
+
+
+def _partsize(partsize):
+    """ Reject multipart part sizes S3 would refuse on completion. """
+    if partsize < S3Writer.__partmin__:
+        raise ValueError("partsize must be at least %d bytes, got %d" %
+                         (S3Writer.__partmin__, partsize))
+
 
+utils.add_copier('s3', 's3', _copy_s3)
 utils.add_handler('s3', S3File)
 utils.add_mapper('dynamodb', DynamoMap)
@@ -0,0 +1,239 @@
+""" fURI caches. """
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+from . import exceptions
+
+
+class LRUCache(object):
+    """ Thread-safe LRU cache with optional TTL.
+
+        At most `maxsize` entries are kept, evicting the least recently used.
+        Entries older than `ttl` seconds are treated as missing; a ttl of None
+        keeps entries until they are evicted or invalidated. Hits & misses
+        are counted. """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__entries__ = OrderedDict()
+        self.__lock__ = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries__)
+
+    def __repr__(self):
+        return "<%s: size=%d hits=%d misses=%d>" % (
+            type(self).__name__, len(self), self.hits, self.misses)
+
+    def get(self, key):
+        """ Get cached value.
+
+            Returns:
+                Tuple of (hit, value). """
+        with self.__lock__:
+            entry = self.__entries__.get(key)
+            if entry is not None and self.ttl is not None \
+                    and time.time() - entry[1] > self.ttl:
+                del self.__entries__[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.__entries__.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def set(self, key, value):
+        """ Cache value at key. """
+        with self.__lock__:
+            self.__entries__[key] = (value, time.time())
+            self.__entries__.move_to_end(key)
+            while len(self.__entries__) > self.maxsize:
+                self.__entries__.popitem(last=False)
+
+    def invalidate(self, key):
+        """ Drop key from the cache. """
+        with self.__lock__:
+            self.__entries__.pop(key, None)
+
+    def clear(self):
+        """ Drop all entries and reset counters. """
+        with self.__lock__:
+            self.__entries__.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class DiskCache(object):
+    """ Persistent local cache of remote file contents.
+
+        Entries are keyed by URI and version (ETag, or mtime & size) and are
+        written to a temporary file that is renamed into place, so several
+        processes can share one cache directory. Caching a new version of a
+        URI drops older ones. Once the total size exceeds `maxsize` bytes the
+        least recently read entries are evicted; the entry just cached is
+        kept even if it alone exceeds `maxsize`. In `offline` mode remote
+        files are never contacted and the newest cached version is served.
+
+        Arguments:
+            root    (str):   Cache directory
+            maxsize (int):   Maximum total size in bytes
+            offline (bool):  Serve cached contents without revalidating """
+
+    def __init__(self, root='~/.cache/furi', maxsize=1024 ** 3,
+                 offline=False):
+        self.root = os.path.expanduser(root)
+        self.maxsize = maxsize
+        self.offline = offline
+
+    def __repr__(self):
+        return "<%s: %s>" % (type(self).__name__, self.root)
+
+    def open(self, uri, version=None, fill=None, mode='rb'):
+        """ Open cached contents of uri, filling the cache on a miss.
+
+            Arguments:
+                uri     (str):   Remote URI
+                version (str):   Remote version; None opens the newest
+                                 cached version
+                fill    (func):  Function writing the contents to a given
+                                 local path (optional)
+                mode    (str):   Open-mode
+
+            Returns:
+                Open local file object. """
+        for _ in range(2):
+            path = self._path(uri, version)
+            try:
+                handle = open(path, mode) if path is not None else None
+            except (IOError, OSError):
+                handle = None
+            if handle is not None:
+                try:
+                    os.utime(path, None)
+                except OSError:
+                    pass
+                return handle
+            if fill is None or version is None:
+                raise exceptions.FuriFileNotFoundError(
+                    "%s is not cached" % uri)
+            self._put(uri, version, fill)
+        raise exceptions.FuriFileNotFoundError("%s was evicted" % uri)
+
+    def clear(self):
+        """ Remove all entries. """
+        for path, _, _ in self._entries():
+            _remove(path)
+
+    def _dir(self, uri):
+        """ Directory holding the versions of uri. """
+        digest = hashlib.sha256(uri.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _entries(self):
+        """ List (path, size, atime) of every cached entry. """
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.startswith('.'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self, keep=None):
+        """ Remove least recently read entries until under maxsize, never
+            removing the entry at `keep`. """
+        entries = sorted(self._entries(), key=lambda x: x[2])
+        total = sum(x[1] for x in entries)
+        for path, size, _ in entries:
+            if total <= self.maxsize:
+                break
+            if path == keep:
+                continue
+            _remove(path)
+            total -= size
+
+    def _path(self, uri, version):
+        """ Path of an entry, or of the newest entry if version is None. """
+        dirpath = self._dir(uri)
+        if version is not None:
+            digest = hashlib.sha256(str(version).encode('utf-8')).hexdigest()
+            return os.path.join(dirpath, digest)
+        try:
+            paths = [os.path.join(dirpath, x) for x in os.listdir(dirpath)
+                     if not x.startswith('.')]
+        except OSError:
+            return None
+        newest = None
+        for path in paths:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            if newest is None or mtime > newest[0]:
+                newest = (mtime, path)
+        return newest[1] if newest is not None else None
+
+    def _put(self, uri, version, fill):
+        """ Fill an entry through a temporary file, then drop older versions
+            and evict. """
+        path = self._path(uri, version)
+        dirpath = os.path.dirname(path)
+        try:
+            os.makedirs(dirpath)
+        except OSError:
+            if not os.path.isdir(dirpath):
+                raise
+        handle, temp = tempfile.mkstemp(dir=dirpath, prefix='.part-')
+        os.close(handle)
+        try:
+            fill(temp)
+            os.rename(temp, path)
+        except Exception:
+            _remove(temp)
+            raise
+        for filename in os.listdir(dirpath):
+            if not filename.startswith('.') \
+                    and filename != os.path.basename(path):
+                _remove(os.path.join(dirpath, filename))
+        self._evict(keep=path)
+
+
+def configure(root='~/.cache/furi', maxsize=1024 ** 3, offline=False,
+              enabled=True):
+    """ Configure the process-wide disk cache used by remote file reads.
+
+        Arguments:
+            root    (str):   Cache directory
+            maxsize (int):   Maximum total size in bytes
+            offline (bool):  Serve cached contents without revalidating
+            enabled (bool):  Set False to disable the disk cache
+
+        Returns:
+            DiskCache or None. """
+    global __disk__  # pylint: disable=global-statement
+    __disk__ = DiskCache(root, maxsize, offline) if enabled else None
+    return __disk__
+
+
+def _remove(path):
+    """ Remove a file, ignoring errors. """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+__disk__ = None
@@ -24,3 +24,8 @@ class ModeError(ValueError):
 class SchemeError(KeyError):
     """ Error finding class to open fURI. """
     pass
+
+
+class UploadError(TypeError):
+    """ Error uploading object. """
+    pass
@@ -3,14 +3,34 @@ try:
     from collections import abc as collections
 except ImportError:
     import collections
+from collections import namedtuple
+import codecs
+from concurrent import futures
+import fnmatch
+import hashlib
+import io
+import mimetypes
+import mmap
 import os
 import re
+import threading
+import weakref
 try:
     from urlparse import urlparse
 except ImportError:
     from urllib.parse import urlparse
 
+from . import cache
 from . import exceptions
+from . import pool
+
+
+__magic__ = re.compile(r'[*?[]')
+
+
+Stat = namedtuple('Stat', ['size', 'mtime', 'etag', 'content_type'])
+TransferResult = namedtuple(
+    'TransferResult', ['source', 'target', 'status', 'error'])
 
 
 class File(collections.Iterable):
@@ -19,6 +39,7 @@ class File(collections.Iterable):
         Exs. file:///abs/path/to/file.ext
              /abs/path/to/file.ext """
 
+    __chunksize__ = 1024 * 1024
     __modes__ = {
         'r', 'rb', 'r+', 'rb+', 'w', 'wb', 'w+', 'wb+', 'a', 'ab', 'a+', 'ab+'}
 
@@ -40,7 +61,7 @@ class File(collections.Iterable):
         return "<%s: %s>" % (type(self).__name__, str(self))
 
     def __iter__(self):
-        return iter(self.stream())
+        return self.iterlines()
 
     def __enter__(self):
         return self
@@ -56,6 +77,48 @@ class File(collections.Iterable):
         """ Test file existence. """
         return self._exists()
 
+    def glob(self, pattern):
+        """ Iterate over URIs below this directory matching a pattern.
+
+            Arguments:
+                pattern (str):  Shell-style wildcard pattern relative to this
+                                directory, ex. '*/part-*.gz'
+
+            Returns:
+                Generator of matching URIs. """
+        dirpath = self.path if self.path.endswith('/') or not self.path \
+            else self.path + '/'
+        for path in self._glob(dirpath, pattern.strip('/').split('/')):
+            yield self.uri._replace(path=path).geturl()
+
+    def iterlines(self, chunksize=None, encoding=None, errors='strict'):
+        """ Iterate over lines, reading the stream in bounded chunks.
+
+            Arguments:
+                chunksize (int):  Bytes read per request
+                                  (default File.__chunksize__)
+                encoding  (str):  Decode binary streams incrementally,
+                                  translating newlines (optional)
+                errors    (str):  Decoding error handler
+
+            Returns:
+                Generator of lines, including line endings. """
+        decoder = None
+        if encoding is not None:
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder(encoding)(errors), True)
+        return self._iterlines(
+            self.stream(), chunksize or self.__chunksize__, decoder)
+
+    def buffer(self):
+        """ Get file contents as a read-only memoryview of a memory map,
+            without copying them. The mapping is released once the view and
+            anything derived from it are released.
+
+            Returns:
+                memoryview of bytes. """
+        return self._buffer()
+
     def matches(self, pattern):
         """ Filename matches pattern.
 
@@ -70,10 +133,46 @@ class File(collections.Iterable):
         """ Read file stream. """
         return self._read(*size)
 
+    def read_changed(self, tag=None, buffer=False):
+        """ Read file contents only if they have changed.
+
+            Arguments:
+                tag    (object):  Revision tag returned by a previous call
+                buffer (bool):    Return contents as a memoryview where
+                                  supported, ex. local files in binary modes
+
+            Returns:
+                Tuple of (tag, contents), where contents is None if the file
+                is unchanged since tag. """
+        return self._read_changed(tag, buffer)
+
+    def readinto(self, buffer):
+        """ Read from the stream into a pre-allocated, writable bytes-like
+            buffer. Binary modes only.
+
+            Returns:
+                Number of bytes read. """
+        return self.stream().readinto(buffer)
+
+    def stat(self, refresh=False):  # pylint: disable=unused-argument
+        """ Get file metadata.
+
+            Arguments:
+                refresh (bool):  Bypass cached metadata
+
+            Returns:
+                Stat record of size, mtime, etag & content_type. """
+        stat = self._stat()
+        if stat is None:
+            raise exceptions.FuriFileNotFoundError(
+                "%s does not exist" % self.uri.geturl())
+        return stat
+
     def stream(self):
         """ Get file contents as stream. """
         if self.__stream__ is not None and hasattr(self.__stream__, 'seek'):
-            self.__stream__.seek(0)
+            if getattr(self.__stream__, 'seekable', lambda: True)():
+                self.__stream__.seek(0)
         else:
             if not self.exists() and 'w' not in self.mode:
                 raise exceptions.FuriFileNotFoundError(
@@ -102,10 +201,109 @@ class File(collections.Iterable):
         """ Test file existence implementation. """
         return os.path.exists(self.path)
 
+    def _glob(self, dirpath, segments):
+        """ Match path segments below dirpath, listing only directories that
+            can still match and only names sharing a segment's literal
+            prefix. """
+        segment, segments = segments[0], segments[1:]
+        if segments and not __magic__.search(segment):
+            for path in self._glob(dirpath + segment + '/', segments):
+                yield path
+            return
+        prefix = __magic__.split(segment)[0]
+        try:
+            dirnames, filenames = self._listdir(dirpath, prefix)
+        except (IOError, OSError):
+            return
+        if segments:
+            candidates = dirnames
+        else:
+            candidates = dirnames + filenames
+        for name in candidates:
+            if name.startswith('.') and not segment.startswith('.'):
+                continue
+            if not fnmatch.fnmatchcase(name, segment):
+                continue
+            if segments:
+                for path in self._glob(dirpath + name + '/', segments):
+                    yield path
+            else:
+                yield dirpath + name
+
+    def _listdir(self, dirpath, prefix=''):
+        """ List subdirectories & files directly under dirpath whose names
+            start with prefix. """
+        dirnames, filenames = [], []
+        for entry in os.scandir(dirpath or '.'):
+            if not entry.name.startswith(prefix):
+                continue
+            if entry.is_dir():
+                dirnames.append(entry.name)
+            else:
+                filenames.append(entry.name)
+        return sorted(dirnames), sorted(filenames)
+
+    @staticmethod
+    def _iterlines(stream, chunksize, decoder=None):
+        """ Split chunks of stream into lines. Only the current chunk and a
+            partial line are held in memory. """
+        partial = []
+        while True:
+            chunk = stream.read(chunksize)
+            eof = not chunk
+            if decoder is not None and not isinstance(chunk, str):
+                chunk = decoder.decode(chunk, final=eof)
+            newline = '\n' if isinstance(chunk, str) else b'\n'
+            if newline in chunk:
+                lines = chunk.split(newline)
+                partial.append(lines[0])
+                lines[0] = chunk[:0].join(partial)
+                partial = [lines.pop()]
+                for line in lines:
+                    yield line + newline
+            elif chunk:
+                partial.append(chunk)
+            if eof:
+                break
+        tail = [x for x in partial if x]
+        if tail:
+            yield tail[0][:0].join(tail)
+
+    def _buffer(self):
+        """ Implementation of buffer(). """
+        with open(self.path, 'rb') as local:
+            try:
+                mapped = mmap.mmap(local.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return memoryview(b'')
+        return memoryview(mapped)
+
     def _read(self, *size):
         """ Read file stream implementation. """
         return self.stream().read(*size)
 
+    def _read_changed(self, tag=None, buffer=False):
+        """ Read-if-changed implementation. Revalidates on mtime & size. """
+        stat = self.stat(refresh=True)
+        current = (stat.mtime, stat.size)
+        if tag is not None and tag == current:
+            return tag, None
+        # The cached stream may still be open on a replaced file
+        self._close()
+        if buffer and 'b' in self.mode:
+            return current, self.buffer()
+        return current, self.read()
+
+    def _stat(self):
+        """ Metadata implementation. Returns None if the file is missing. """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return Stat(stat.st_size, stat.st_mtime, None,
+                    mimetypes.guess_type(self.path)[0])
+
     def _stream(self):
         """ Implementation of stream(). """
         return open(self.path, self.mode)
@@ -125,50 +323,451 @@ class File(collections.Iterable):
             return self.stream().write(stream)
 
 
+class TransferConfig(object):
+    """ Tuning for remote file transfers.
+
+        Arguments:
+            concurrency (int):   Maximum number of concurrent requests
+            chunksize   (int):   Size in bytes of each ranged request/part
+            threads     (bool):  Transfer chunks concurrently on threads """
+
+    def __init__(self, concurrency=10, chunksize=8 * 1024 * 1024,
+                 threads=True):
+        self.concurrency = concurrency
+        self.chunksize = chunksize
+        self.threads = threads
+
+    def __repr__(self):
+        return "<%s: concurrency=%r chunksize=%r threads=%r>" % (
+            type(self).__name__, self.concurrency, self.chunksize,
+            self.threads)
+
+    @classmethod
+    def create(cls, config=None):
+        """ Coerce None, a dict or a TransferConfig into a TransferConfig. """
+        if config is None:
+            return cls()
+        if isinstance(config, cls):
+            return config
+        return cls(**config)
+
+
+class RemoteReader(io.RawIOBase):
+    """ Seekable reader over a remote file of known `size`. Subclasses
+        implement readinto() and readall() from the current position. """
+
+    size = None
+
+    def __init__(self):
+        super(RemoteReader, self).__init__()
+        self.__pos__ = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.__pos__
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self.__pos__ + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError("Invalid whence (%r)" % whence)
+        if pos < 0:
+            raise ValueError("Negative seek position %d" % pos)
+        self.__pos__ = pos
+        return pos
+
+
+class RemoteWriter(io.RawIOBase):
+    """ Write-only stream to a remote file. Subclasses implement _write(),
+        _commit() and _abort(); any failure while writing or committing
+        aborts the upload. """
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = data.encode('utf-8')
+        try:
+            self._write(data)
+        except Exception:
+            self.abort()
+            raise
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._commit()
+        except Exception:
+            self.abort()
+            raise
+        super(RemoteWriter, self).close()
+
+    def abort(self):
+        """ Abort the upload and discard written data. """
+        if self.closed:
+            return
+        try:
+            self._abort()
+        finally:
+            super(RemoteWriter, self).close()
+
+    def _write(self, data):
+        """ Send or buffer data. """
+        raise NotImplementedError
+
+    def _commit(self):
+        """ Complete the upload. """
+        raise NotImplementedError
+
+    def _abort(self):
+        """ Discard the upload. """
+        raise NotImplementedError
+
+
 class RemoteFile(File):
-    """ Remote file implementation. """
-    def __init__(self, uri, mode='r', **connectkw):
+    """ Remote file implementation.
+
+        Connections are shared through a process-wide ConnectionPool keyed by
+        scheme, host, a fingerprint of the credentials and the calling
+        thread, since neither boto3 resources nor SFTP channels may be used
+        from several threads at once. A file leases a pooled connection per
+        thread from connecting until it is closed (or collected), so the
+        pool never closes a connection mid-transfer. Set __pool__ to None to
+        give each file its own connection.
+
+        Reads & downloads go through `diskcache`, a furi.cache.DiskCache,
+        when one is given or configured process-wide with
+        furi.cache.configure(); pass diskcache=False to bypass it. Text-mode
+        cached reads are decoded unless the backend streams bytes in every
+        mode (__decode__ = False). """
+
+    __decode__ = True
+    __pool__ = pool.__pool__
+
+    def __init__(self, uri, mode='r', diskcache=None, **connectkw):
         super(RemoteFile, self).__init__(uri, mode=mode)
+        self.diskcache = diskcache
         self.__connect__ = connectkw
         self.__connection__ = None
+        self.__leases__ = {}
+        self.__poolkey__ = None
+        self.__stat__ = None
 
     @property
     def connection(self):
-        """ Remote connection. """
-        if self.__connection__ is None:
-            self.connect()
-        return self.__connection__
+        """ Remote connection of the calling thread. """
+        if self.__poolkey__ is None:
+            if self.__connection__ is None:
+                self.connect()
+            if self.__poolkey__ is None:
+                return self.__connection__
+        lease = self.__leases__.get(threading.current_thread().ident)
+        if lease is None or not self._healthy(lease[0]):
+            lease = self._lease()
+        return lease[0]
 
     def connect(self, **connectkw):
         """ Connect to remote. """
         if any(connectkw):
             self.__connect__ = connectkw
-        self.__connection__ = self._connect()
+        self._release()
+        if self.__pool__ is None:
+            self.__poolkey__ = None
+            self.__connection__ = self._connect()
+        else:
+            self.__poolkey__ = self._poolkey()
+            self._lease()
+
+    def download(self, target, config=None, callback=None):
+        """ Download remote file to local target URI.
+
+            Arguments:
+                target   (File):                    Local target file
+                config   (TransferConfig or dict):  Transfer tuning
+                callback (func):                    Progress callback, called
+                                                    with the number of bytes
+                                                    transferred since the
+                                                    previous call
+
+            Returns:
+                Handle to target file """
+        config = TransferConfig.create(config)
+        diskcache = self._diskcache()
+        if diskcache is None:
+            return self._download(target, config, callback)
+        filled = []
+
+        def progress(size):
+            """ Report progress of filling the cache on a miss. """
+            filled.append(size)
+            callback(size)
+
+        with self._cached(diskcache, 'rb', config,
+                          progress if callback is not None else None) \
+                as cached:
+            with open(target.path, 'wb') as local:
+                while True:
+                    chunk = cached.read(config.chunksize)
+                    if not chunk:
+                        break
+                    local.write(chunk)
+                    # A miss already reported the bytes as they arrived
+                    if callback is not None and not filled:
+                        callback(len(chunk))
+        return target
+
+    def close(self):
+        """ Close stream and release the pooled connection. """
+        try:
+            return super(RemoteFile, self).close()
+        finally:
+            self.__stat__ = None
+            self._release()
+
+    def read_changed(self, tag=None, buffer=False):
+        """ Read file contents only if they have changed. With an offline
+            disk cache the newest cached version is served without
+            contacting the remote; its tag changes only when a new version
+            is cached.
+
+            Arguments:
+                tag    (object):  Revision tag returned by a previous call
+                buffer (bool):    Return contents as a memoryview
+
+            Returns:
+                Tuple of (tag, contents), where contents is None if the file
+                is unchanged since tag. """
+        diskcache = self._diskcache()
+        if diskcache is None or not diskcache.offline \
+                or set(self.mode) & set('wa+'):
+            return super(RemoteFile, self).read_changed(tag, buffer)
+        binary = buffer or 'b' in self.mode or not self.__decode__
+        with self._cached(diskcache, 'rb' if binary else 'r') as cached:
+            current = os.path.basename(cached.name)
+            if tag is not None and tag == current:
+                return tag, None
+            data = cached.read()
+        return current, memoryview(data) if buffer else data
+
+    def stat(self, refresh=False):
+        """ Get file metadata, cached until the file is written or closed.
+
+            Arguments:
+                refresh (bool):  Bypass cached metadata
+
+            Returns:
+                Stat record of size, mtime, etag & content_type. """
+        if refresh:
+            self.__stat__ = None
+        return super(RemoteFile, self).stat()
+
+    def stream(self):
+        """ Get file contents as stream, served from the disk cache when
+            reading with one configured. """
+        diskcache = self._diskcache()
+        if diskcache is None or set(self.mode) & set('wa+'):
+            return super(RemoteFile, self).stream()
+        if self.__stream__ is None or self.__stream__.closed:
+            binary = 'b' in self.mode or not self.__decode__
+            self.__stream__ = self._cached(diskcache, 'rb' if binary else 'r')
+        else:
+            self.__stream__.seek(0)
+        return self.__stream__
 
-    def download(self, target):
-        """ Download remote file to local target URI. """
-        return self._download(target)
+    def write(self, stream):
+        """ Write stream. """
+        try:
+            super(RemoteFile, self).write(stream)
+        finally:
+            self.__stat__ = None
+
+    def synced(self, target):
+        """ Test whether a local target already holds the remote contents. """
+        return target.exists() and self._synced(target)
+
+    def _cached(self, diskcache, mode, config=None, callback=None):
+        """ Open the cached contents, downloading them on a miss. """
+        if diskcache.offline:
+            return diskcache.open(str(self), mode=mode)
+        stat = self.stat()
+        version = stat.etag or "%r:%r" % (stat.mtime, stat.size)
+        return diskcache.open(
+            str(self), version, mode=mode,
+            fill=lambda path: self._download(
+                File(path, mode='wb'), config, callback))
+
+    def _diskcache(self):
+        """ Disk cache in use, if any. """
+        if self.diskcache is False:
+            return None
+        return self.diskcache or cache.__disk__
 
     def _connect(self):
         """ Connect to remote implementation. """
         raise NotImplementedError
 
-    def _download(self, target):
+    def _disconnect(self, connection):
+        """ Close a pooled connection. """
+        close = getattr(connection, 'close', None)
+        if close is not None:
+            close()
+
+    def _healthy(self, connection):  # pylint: disable=unused-argument
+        """ Test whether a pooled connection can be reused. """
+        return True
+
+    def _host(self):
+        """ Host part of the pool key. """
+        return self.uri.hostname, self.uri.port
+
+    def _lease(self):
+        """ Lease the calling thread's connection from the pool, releasing
+            any lease it holds. The lease is also released if the file is
+            garbage-collected.
+
+            Returns:
+                Tuple of (connection, release function). """
+        ident = threading.current_thread().ident
+        self._release(ident)
+        key = self.__poolkey__ + (ident,)
+        connection = self.__pool__.acquire(
+            key, self._connect, self._healthy, self._disconnect)
+        lease = (connection, weakref.finalize(
+            self, self.__pool__.release, key, connection))
+        self.__leases__[ident] = lease
+        return lease
+
+    def _release(self, ident=None):
+        """ Release the leased pooled connection of thread ident, or of
+            every thread. """
+        idents = list(self.__leases__) if ident is None else [ident]
+        for key in idents:
+            lease = self.__leases__.pop(key, None)
+            if lease is not None:
+                lease[1]()
+
+    def _poolkey(self):
+        """ Pool key of scheme, host & credential fingerprint. """
+        credentials = (
+            self.uri.username,
+            self.uri.password,
+            sorted(self.__connect__.items(), key=lambda x: x[0]))
+        fingerprint = hashlib.sha256(repr(credentials).encode('utf-8'))
+        return self.uri.scheme, self._host(), fingerprint.hexdigest()
+
+    def _download(self, target, config=None, callback=None):
         """ Download remote file to local target URI implementation. """
         raise NotImplementedError
 
     def _exists(self):
         """ Test file existence. """
+        try:
+            self.stat()
+        except exceptions.FuriFileNotFoundError:
+            return False
+        return True
+
+    def _stat(self):
+        """ Cached metadata. Missing files are cached as well. """
+        if self.__stat__ is None:
+            self.__stat__ = (self._fetchstat(),)
+        return self.__stat__[0]
+
+    def _fetchstat(self):
+        """ Metadata implementation. Returns None if the file is missing. """
         raise NotImplementedError
 
+    def _synced(self, target):  # pylint: disable=unused-argument
+        """ Test target contents implementation. Remotes that cannot compare
+            contents never report a match. """
+        return False
+
+    def _buffer(self):
+        """ Implementation of buffer(). Remote contents are mapped from the
+            disk cache if one is in use, otherwise read into memory. """
+        diskcache = self._diskcache()
+        if diskcache is None:
+            stream = self.stream()
+            return memoryview(getattr(stream, 'buffer', stream).read())
+        with self._cached(diskcache, 'rb') as cached:
+            try:
+                mapped = mmap.mmap(cached.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return memoryview(b'')
+        return memoryview(mapped)
+
+    def _read_changed(self, tag=None, buffer=False):
+        """ Read-if-changed implementation. Remotes that cannot revalidate
+            cheaply always report a change. """
+        return None, self.buffer() if buffer else self.read()
+
     def _write(self, stream):
         """ Write stream to file. """
         raise NotImplementedError
 
+    def _listdir(self, dirpath, prefix=''):
+        """ Directory listing implementation. """
+        raise NotImplementedError
+
     def _walk(self, **kwargs):
         """ Implementation of walk(). """
         raise NotImplementedError
 
+    @staticmethod
+    def _walktree(root, listdir, child, workers=1):
+        """ Walk a tree one directory listing at a time, depth first. With
+            `workers` > 1 sibling directories are listed concurrently ahead
+            of being yielded.
+
+            Arguments:
+                root    (str):   Top directory path
+                listdir (func):  Called with a directory path, returns a
+                                 tuple of (dirnames, listing)
+                child   (func):  Called with a directory path and the name
+                                 of a subdirectory, returns its path
+                workers (int):   Number of concurrent listings
+
+            Yields:
+                Tuples of (dirpath, dirnames, listing). """
+        executor = futures.ThreadPoolExecutor(workers) if workers > 1 else None
+
+        def pending(dirpath):
+            """ Start listing dirpath if walking in parallel. """
+            if executor is None:
+                return dirpath, None
+            return dirpath, executor.submit(listdir, dirpath)
+
+        stack = [pending(root)]
+        try:
+            while stack:
+                dirpath, future = stack.pop()
+                if future is None:
+                    dirnames, listing = listdir(dirpath)
+                else:
+                    dirnames, listing = future.result()
+                yield dirpath, dirnames, listing
+                stack.extend(pending(child(dirpath, dirname))
+                             for dirname in reversed(dirnames))
+        finally:
+            if executor is not None:
+                for _, future in stack:
+                    future.cancel()
+                executor.shutdown(wait=True)
+
     def _stream(self):
         """ Implementation of stream(). """
         raise NotImplementedError
@@ -3,16 +3,38 @@ try:
     from collections import abc as collections
 except ImportError:
     import collections
-import os
+from concurrent import futures
+import threading
+import time
+import weakref
 
 from . import utils
 
 
 class FileMap(collections.Mapping):
-    """ Base configuration for file objects. """
+    """ Base configuration for file objects.
 
-    def __init__(self, uri, **kwargs):
+        The source is read as bytes and parsed by the function registered for
+        its (possibly compound) extension, ex. '.json.gz'. Parsers marked with
+        parsers.buffered are handed a memoryview, memory-mapped for local
+        files, instead of a copy. Other parsers get the contents as before:
+        text for sources that decode text (ex. local & SFTP files) unless a
+        binary `mode` is passed, and bytes otherwise.
+
+        Parsed contents are cached and revalidated against the source at most
+        once every `ttl` seconds. A `ttl` of 0 revalidates on every access and
+        a `ttl` of None never revalidates. """
+
+    def __init__(self, uri, ttl=0, **kwargs):
+        decode = 'mode' not in kwargs
+        kwargs.setdefault('mode', 'rb')
         self.source = utils.open(uri, **kwargs)
+        self.ttl = ttl
+        self.__decode__ = decode and getattr(self.source, '__decode__', True)
+        self.__cache__ = None
+        self.__checked__ = None
+        self.__lock__ = threading.Lock()
+        self.__revision__ = 0
 
     def __str__(self):
         return str(self.source)
@@ -38,49 +60,223 @@ class FileMap(collections.Mapping):
         except Exception as err:
             raise ValueError(err)
 
+    def invalidate(self):
+        """ Drop cached contents so the next access re-reads the source. """
+        with self.__lock__:
+            self.__cache__ = None
+            self.__checked__ = None
+
+    def snapshot(self):
+        """ Revalidate and get the parsed contents with their revision.
+
+            Returns:
+                Tuple of (revision, contents), where revision is a counter
+                incremented each time the source is re-parsed. """
+        with self.__lock__:
+            now = time.time()
+            if self.__cache__ is not None and \
+                    (self.ttl is None or now - self.__checked__ < self.ttl):
+                return self.__revision__, self.__cache__[1]
+            tag = self.__cache__[0] if self.__cache__ is not None else None
+            func = utils.extfunc(self._ext())
+            buffered = getattr(func, 'buffered', False) is True
+            tag, data = self.source.read_changed(tag, buffer=buffered)
+            if data is not None and not buffered and self.__decode__:
+                data = bytes(data).decode('utf-8')
+            if data is not None:
+                self.__cache__ = (tag, func(data))
+                self.__revision__ += 1
+            else:
+                self.__cache__ = (tag, self.__cache__[1])
+            self.__checked__ = now
+            return self.__revision__, self.__cache__[1]
+
     def _read(self):
-        """ Read contents and parse from __dispatch__. """
-        ext = os.path.splitext(str(self))[-1]
-        func = utils.extfunc(ext)
-        return func(self.source.read())
+        """ Read contents and parse from __dispatch__, re-using the cached
+            contents while they are fresh or the source is unchanged. """
+        return self.snapshot()[1]
+
+    def _ext(self):
+        """ Full extension of the source filename, ex. '.json.gz'. Dotfiles
+            without another extension, ex. '.env', are their own. """
+        filename = self.source.filename
+        index = filename.find('.', 1)
+        if index > 0:
+            return filename[index:]
+        return filename if filename.startswith('.') else ''
 
 
 class ChainedMap(collections.Mapping):
-    """ Chained AWS or locally backed mappings. """
-    def __init__(self, *mappings):
+    """ Chained AWS or locally backed mappings.
+
+        Keys resolve against the first mapping that holds them. Mappings
+        with a `snapshot()` (ex. FileMap) are merged into a cached index of
+        key to owning mapping that is rebuilt only when one of them reports
+        a new revision, so lookups don't re-read or re-parse layers. Other
+        mappings (ex. DynamoMap) are queried in order. Mappings that fail to
+        load are skipped.
+
+        Snapshot mappings are revalidated at most once every `ttl` seconds;
+        in between, lookups only touch the cached index. A `ttl` of 0
+        revalidates on every access and a `ttl` of None never revalidates.
+
+        With `workers` > 1, snapshot mappings are fetched & parsed
+        concurrently and other mappings are queried concurrently, taking the
+        highest-priority hit. With `prefetch` the index is built when the
+        chain is created rather than on first access. The worker threads are
+        stopped by close(), on leaving a `with` block or when the chain is
+        garbage-collected. """
+
+    def __init__(self, *mappings, **kwargs):
+        workers = kwargs.pop('workers', 1)
+        prefetch = kwargs.pop('prefetch', False)
+        self.ttl = kwargs.pop('ttl', 5)
+        if kwargs:
+            raise TypeError("Unexpected keyword arguments: %s" %
+                            ", ".join(sorted(kwargs)))
         self.mappings = mappings
+        self.__checked__ = None
+        self.__index__ = {}
+        self.__indexed__ = frozenset(
+            x for x, y in enumerate(mappings) if hasattr(y, 'snapshot'))
+        self.__keys__ = {}
+        self.__lock__ = threading.Lock()
+        self.__pool__ = None
+        self.__revisions__ = None
+        if workers > 1:
+            self.__pool__ = futures.ThreadPoolExecutor(workers)
+            weakref.finalize(self, self.__pool__.shutdown, False)
+        if prefetch:
+            self._index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def __getitem__(self, key):
-        return self._read('__getitem__', key)
+        index, _ = self._index()
+        owner, value = index.get(key, (len(self.mappings), None))
+        candidates = [x for x in range(owner) if x not in self.__indexed__]
+        pool = self.__pool__
+        if pool is not None and len(candidates) > 1:
+            pending = [pool.submit(self._get, self.mappings[x], key)
+                       for x in candidates]
+            try:
+                for future in pending:
+                    hit, result = future.result()
+                    if hit:
+                        return result
+            finally:
+                for future in pending:
+                    future.cancel()
+        else:
+            for position in candidates:
+                hit, result = self._get(self.mappings[position], key)
+                if hit:
+                    return result
+        if owner < len(self.mappings):
+            return value
+        raise KeyError(key)
 
     def __iter__(self):
-        return self._read('__iter__')
+        _, indexed = self._index()
+        seen = set()
+        for position, mapping in enumerate(self.mappings):
+            if position in self.__indexed__:
+                keys = indexed[position]
+            else:
+                keys = self._keys(mapping)
+            for key in keys:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
 
     def __len__(self):
-        return self._read('__len__')
+        index, _ = self._index()
+        if len(self.__indexed__) == len(self.mappings):
+            return len(index)
+        return sum(1 for _ in self)
 
-    def _read(self, func, *args, **kwargs):
-        """ Try to access mappings in chain, return the first success.
+    def close(self):
+        """ Stop the worker threads. Later lookups query layers in turn. """
+        with self.__lock__:
+            pool, self.__pool__ = self.__pool__, None
+        if pool is not None:
+            pool.shutdown(wait=True)
 
-            Arguments:
-                func   (str):    Name of self-function to run against each cfg
-                args   (tuple):  Tuple of arguments to func
-                kwargs (dict):   Dictionary of arguments to func
+    def _index(self):
+        """ Get the key index, rebuilding it if any snapshot has changed.
 
             Returns:
-                The return value of 'func(*args, **kwargs)' for the first
-                cfg that does not throw an Exception. """
-        for cfg in self.mappings:
-            try:
-                return getattr(cfg, func)(*args, **kwargs)
-            except (KeyError, ValueError, StopIteration) as err:
-                pass
-        raise err
+                Tuple of a dictionary of key to (position, value) for the
+                first snapshot mapping holding each key, and a dictionary of
+                position to the keys of each snapshot mapping. """
+        with self.__lock__:
+            now = time.time()
+            if self.__checked__ is not None and (
+                    self.ttl is None or now - self.__checked__ < self.ttl):
+                return self.__index__, self.__keys__
+            positions = sorted(self.__indexed__)
+            if self.__pool__ is not None and len(positions) > 1:
+                results = self.__pool__.map(self._snapshot, positions)
+            else:
+                results = [self._snapshot(x) for x in positions]
+            snapshots = dict(zip(positions, results))
+            revisions = [snapshots[x][0] for x in sorted(snapshots)]
+            if revisions != self.__revisions__:
+                index = {}
+                for position in sorted(snapshots, reverse=True):
+                    for key, value in snapshots[position][1].items():
+                        index[key] = (position, value)
+                self.__index__ = index
+                self.__keys__ = dict(
+                    (x, list(y[1])) for x, y in snapshots.items())
+                self.__revisions__ = revisions
+            self.__checked__ = now
+            return self.__index__, self.__keys__
+
+    @staticmethod
+    def _get(mapping, key):
+        """ Look up key in mapping.
+
+            Returns:
+                Tuple of (hit, value). """
+        try:
+            return True, mapping[key]
+        except (KeyError, ValueError):
+            return False, None
+
+    def _snapshot(self, position):
+        """ Snapshot of the mapping at position; empty if it fails to load. """
+        try:
+            return self.mappings[position].snapshot()
+        except Exception:  # pylint: disable=broad-except
+            return None, {}
+
+    @staticmethod
+    def _keys(mapping):
+        """ Keys of mapping, or none if it cannot be iterated. Mappings
+            whose iteration yields items (ex. DynamoMap) provide `keys()`. """
+        try:
+            if hasattr(mapping, 'keys'):
+                return list(mapping.keys())
+            return list(mapping)
+        except Exception:  # pylint: disable=broad-except
+            return []
+
 
+def chain(*mappings, **kwargs):
+    """ Chain mappings together.
 
-def chain(*mappings):
-    """ Chain mappings together. """
-    return ChainedMap(*mappings)
+        Arguments:
+            mappings (tuple):  Mappings in priority order
+            workers  (int):    Number of layers fetched concurrently
+            prefetch (bool):   Fetch & parse file layers immediately
+            ttl      (float):  Seconds between revalidations of file layers
+                               (default 5) """
+    return ChainedMap(*mappings, **kwargs)
 
 
 utils.add_mapper('', FileMap)
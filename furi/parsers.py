@@ -0,0 +1,134 @@
+""" fURI FileMap parsers.
+
+    Parser backends are imported on first use, preferring the fastest
+    installed implementation. Parsers marked as `buffered` accept any
+    bytes-like object, ex. a memoryview of a memory-mapped file. """
+import gzip
+import json
+
+
+def buffered(func):
+    """ Mark a parser as accepting any bytes-like object. """
+    func.buffered = True
+    return func
+
+
+@buffered
+def load_env(data):
+    """ Parse dotenv-style KEY=VALUE lines. """
+    parsed = {}
+    for line in _text(data).splitlines():
+        line = line.strip()
+        if line.startswith('export '):
+            line = line[len('export '):].lstrip()
+        key, sep, value = line.partition('=')
+        if not sep or line.startswith('#'):
+            continue
+        value = value.strip()
+        if len(value) > 1 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        else:
+            value = value.split(' #')[0].rstrip()
+        parsed[key.strip()] = value
+    return parsed
+
+
+@buffered
+def load_ini(data):
+    """ Parse INI sections into a mapping of mappings. """
+    import configparser
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read_string(_text(data))
+    return dict((x, dict(parser.items(x))) for x in parser.sections())
+
+
+@buffered
+def load_json(data):
+    """ Parse JSON using orjson or ujson if installed. """
+    return _loader('json')(data)
+
+
+@buffered
+def load_json_gz(data):
+    """ Parse gzipped JSON. """
+    return load_json(gzip.decompress(data))
+
+
+@buffered
+def load_toml(data):
+    """ Parse TOML using tomllib, tomli or toml. """
+    return _loader('toml')(_text(data))
+
+
+def load_yaml(data):
+    """ Parse YAML safely using the libyaml loader if available. """
+    return _loader('yaml')(data)
+
+
+def _json():
+    """ Fastest available JSON parser. Only orjson parses buffers in
+        place. """
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import ujson
+        return lambda data: ujson.loads(_bytes(data))
+    except ImportError:
+        return lambda data: json.loads(_bytes(data))
+
+
+def _toml():
+    """ Available TOML parser. """
+    try:
+        import tomllib
+        return tomllib.loads
+    except ImportError:
+        pass
+    try:
+        import tomli
+        return tomli.loads
+    except ImportError:
+        import toml
+        return toml.loads
+
+
+def _yaml():
+    """ Safe YAML parser, preferring libyaml's CSafeLoader. """
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return lambda data: yaml.load(data, Loader=loader)
+
+
+def _loader(name):
+    """ Get the named parser, importing its backend on first use. """
+    try:
+        return __loaders__[name]
+    except KeyError:
+        __loaders__[name] = __backends__[name]()
+        return __loaders__[name]
+
+
+def _bytes(data):
+    """ Copy buffers other than bytes & str into bytes. """
+    if isinstance(data, (bytes, str)):
+        return data
+    return bytes(data)
+
+
+def _text(data):
+    """ Decode bytes-like data as UTF-8, dropping any byte-order mark. """
+    if isinstance(data, str):
+        return data
+    return str(data, 'utf-8-sig')
+
+
+__backends__ = {
+    'json': _json,
+    'toml': _toml,
+    'yaml': _yaml}
+
+
+__loaders__ = {}
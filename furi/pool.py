@@ -0,0 +1,166 @@
+""" fURI connection pooling. """
+from collections import OrderedDict
+import threading
+import time
+
+
+class ConnectionPool(object):
+    """ Thread-safe cache of remote connections.
+
+        Connections are keyed by scheme, host and a credential fingerprint.
+        At most `maxsize` connections are kept, evicting the least recently
+        used; connections unused for more than `maxidle` seconds are closed.
+        A maxidle of None keeps idle connections open.
+
+        Connections taken with acquire() are leased until release(); leased
+        connections are never expired or evicted, and one replaced while
+        leased is closed once its last lease is released. """
+
+    def __init__(self, maxsize=64, maxidle=600):
+        self.maxsize = maxsize
+        self.maxidle = maxidle
+        self.__connections__ = OrderedDict()
+        self.__locks__ = {}
+        self.__lock__ = threading.Lock()
+        self.__retired__ = {}
+
+    def __len__(self):
+        return len(self.__connections__)
+
+    def __contains__(self, key):
+        return key in self.__connections__
+
+    def acquire(self, key, connect, healthy=None, close=None):
+        """ Lease a pooled connection, connecting if needed.
+
+            Arguments:
+                key     (tuple):  Pool key
+                connect (func):   Function returning a new connection
+                healthy (func):   Function testing a pooled connection
+                close   (func):   Function closing a connection
+
+            Returns:
+                Connection object, held until passed to release(). """
+        return self._get(key, connect, healthy, close, 1)
+
+    def get(self, key, connect, healthy=None, close=None):
+        """ Get a pooled connection, connecting if needed. The connection is
+            not leased, so it may be closed once idle or evicted.
+
+            Arguments:
+                key     (tuple):  Pool key
+                connect (func):   Function returning a new connection
+                healthy (func):   Function testing a pooled connection
+                close   (func):   Function closing a connection
+
+            Returns:
+                Connection object. """
+        return self._get(key, connect, healthy, close, 0)
+
+    def release(self, key, connection):
+        """ Release a lease taken with acquire(). """
+        stale = []
+        with self.__lock__:
+            entry = self.__connections__.get(key)
+            if entry is not None and entry[0] is connection:
+                entry[1] = time.time()
+                entry[3] -= 1
+            else:
+                entry = self.__retired__.get(id(connection))
+                if entry is not None:
+                    entry[3] -= 1
+                    if entry[3] <= 0:
+                        stale.append(self.__retired__.pop(id(connection)))
+        self._close(stale)
+
+    def discard(self, key):
+        """ Close and remove a pooled connection. """
+        with self.__lock__:
+            entry = self.__connections__.pop(key, None)
+        self._close([entry] if entry is not None else [])
+
+    def close_all(self):
+        """ Close and remove all pooled connections, leased or not. """
+        with self.__lock__:
+            stale = list(self.__connections__.values())
+            stale.extend(self.__retired__.values())
+            self.__connections__.clear()
+            self.__retired__.clear()
+        self._close(stale)
+
+    def _get(self, key, connect, healthy, close, leases):
+        """ Get a pooled connection, adding leases. """
+        with self.__lock__:
+            keylock = self.__locks__.setdefault(key, threading.Lock())
+        with keylock:
+            with self.__lock__:
+                stale = self._expire()
+                entry = self.__connections__.get(key)
+            if entry is not None and healthy is not None \
+                    and not healthy(entry[0]):
+                with self.__lock__:
+                    self.__connections__.pop(key, None)
+                    stale.extend(self._retire([entry]))
+                entry = None
+            if entry is None:
+                entry = [connect(), None, close, 0]
+            with self.__lock__:
+                entry[1] = time.time()
+                entry[3] += leases
+                self.__connections__[key] = entry
+                self.__connections__.move_to_end(key)
+                stale.extend(self._evict(key))
+        self._close(stale)
+        return entry[0]
+
+    def _evict(self, keep):
+        """ Pop least recently used unleased entries other than `keep` over
+            maxsize. Call with lock held. """
+        stale = []
+        for key, entry in list(self.__connections__.items()):
+            if len(self.__connections__) <= self.maxsize:
+                break
+            if entry[3] <= 0 and key != keep:
+                stale.append(self.__connections__.pop(key))
+        return stale
+
+    def _expire(self):
+        """ Pop unleased entries idle longer than maxidle. Call with lock
+            held. """
+        stale = []
+        if self.maxidle is None:
+            return stale
+        cutoff = time.time() - self.maxidle
+        for key, entry in list(self.__connections__.items()):
+            if entry[1] < cutoff and entry[3] <= 0:
+                stale.append(self.__connections__.pop(key))
+        return stale
+
+    def _retire(self, entries):
+        """ Hold leased entries until released; return the rest to close.
+            Call with lock held. """
+        stale = []
+        for entry in entries:
+            if entry[3] > 0:
+                self.__retired__[id(entry[0])] = entry
+            else:
+                stale.append(entry)
+        return stale
+
+    @staticmethod
+    def _close(entries):
+        """ Close popped entries, ignoring errors. """
+        for connection, _, close, _ in entries:
+            try:
+                if close is not None:
+                    close(connection)
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+
+def close_all():
+    """ Close all pooled remote connections. """
+    __pool__.close_all()
+
+
+__pool__ = ConnectionPool()
@@ -1,16 +1,21 @@
 """ fURI utilities """
 
 
-import json
+from concurrent import futures
+import io
 import os
+import sys
 try:
     from urlparse import urlparse
 except ImportError:
     from urllib.parse import urlparse
 
-import yaml
 from . import furifile
 from . import exceptions
+from . import parsers
+
+
+DownloadResult = furifile.TransferResult
 
 
 def add_handler(scheme, cls):
@@ -22,6 +27,18 @@ def add_handler(scheme, cls):
     __dispatch__[scheme] = cls
 
 
+def add_copier(source, target, func):
+    """ Add a copy implementation for a pair of URI schemes.
+
+        Arguments:
+            source (str):   Source URI scheme
+            target (str):   Target URI scheme
+            func   (func):  Function copying between open source & target
+                            files, called with (source, target, config,
+                            callback) """
+    __copydispatch__[(source or 'file', target or 'file')] = func
+
+
 def add_mapper(scheme, cls):
     """ Add a new class to the dispatcher
 
@@ -40,6 +57,65 @@ def add_mapext(ext, func):
     __extdispatch__[ext] = func
 
 
+def copy(source, target, config=None, callback=None,
+         source_credentials=None, target_credentials=None, **credentials):
+    """ Copy contents of a source URI into a target URI using the cheapest
+        path available: a registered copier for the pair of schemes (ex.
+        server-side S3 copies or kernel-side local copies), a download for
+        remote sources into local targets, or else a stream piped from
+        source to target in bounded chunks.
+
+        Arguments:
+            source             (str or File):  Source URI or open file
+            target             (str or File):  Target URI or open file
+            config             (TransferConfig or dict):
+                                               Transfer tuning, ex.
+                                               concurrency, chunksize &
+                                               threads (optional)
+            callback           (func):         Progress callback, called
+                                               with bytes transferred since
+                                               the previous call (optional)
+            source_credentials (dict):         Optional connection
+                                               credentials for a source URI
+            target_credentials (dict):         Optional connection
+                                               credentials for a target URI
+            credentials        (dict):         Optional connection
+                                               credentials for both URIs,
+                                               overridden by the above
+
+        Returns:
+            Handle to target file """
+    src = open(source, mode='rb') if isinstance(source, str) else source
+    tgt = open(target, mode='wb') if isinstance(target, str) else target
+    for opened, given, connectkw in ((src, source, source_credentials),
+                                     (tgt, target, target_credentials)):
+        connectkw = dict(credentials, **(connectkw or {}))
+        if opened is not given and connectkw \
+                and isinstance(opened, furifile.RemoteFile):
+            opened.connect(**connectkw)
+    config = furifile.TransferConfig.create(config)
+    if not isinstance(tgt, furifile.RemoteFile) \
+            and not os.path.isdir(tgt.workdir or '.'):
+        os.makedirs(tgt.workdir)
+    func = __copydispatch__.get(
+        (src.uri.scheme or 'file', tgt.uri.scheme or 'file'))
+    try:
+        if func is not None:
+            func(src, tgt, config, callback)
+        elif isinstance(src, furifile.RemoteFile) \
+                and not isinstance(tgt, furifile.RemoteFile):
+            src.download(tgt, config=config, callback=callback)
+        else:
+            with tgt:
+                stream = src.stream()
+                tgt.write(
+                    _Progress(getattr(stream, 'buffer', stream), callback))
+    finally:
+        if src is not source:
+            src.close()
+    return tgt
+
+
 def exists(uri, **kwargs):
     """ Returns True if URI exists. """
     with open(uri, **kwargs) as exister:
@@ -66,45 +142,193 @@ def open(uri, **kwargs):  # pylint: disable=redefined-builtin
             "Unsupported URI scheme: '%s'" % uri.scheme)
 
 
+def glob(uri, **kwargs):
+    """ Return a list of URIs matching a shell-style wildcard pattern. """
+    return list(iglob(uri, **kwargs))
+
+
+def iglob(uri, **kwargs):
+    """ Iterate over URIs matching a shell-style wildcard pattern, ex.
+        's3://bucket/logs/2026/*/part-*.gz'. Listing starts at the longest
+        literal directory prefix of the pattern. """
+    uri = urlparse(os.path.expanduser(uri))
+    segments = uri.path.split('/')
+    for index, segment in enumerate(segments):
+        if furifile.__magic__.search(segment):
+            break
+    else:
+        if exists(uri.geturl(), **kwargs):
+            yield uri.geturl()
+        return
+    root = '/'.join(segments[:index])
+    root = uri._replace(path=root + '/' if index else '').geturl()
+    with open(root, **kwargs) as globber:
+        for match in globber.glob('/'.join(segments[index:])):
+            yield match
+
+
 def walk(uri, **kwargs):
     """ Walk a Directory given a URI. """
     with open(uri, **kwargs) as walker:
         return walker.walk()
 
 
-def download(source, target=None, **credentials):
+def download(source, target=None, config=None, callback=None, **credentials):
     """ Download contents of a source URI into a target URI. If target URI is
         omitted, source is downloaded to ~/Downloads using the same filename.
 
         Arguments:
-            source      (str):   URI of source file
-            target      (str):   URI of target file (optional)
-            credentials (dict):  Optional source connection credentials
+            source      (str):                     URI of source file
+            target      (str):                     URI of target file
+                                                   (optional)
+            config      (TransferConfig or dict):  Transfer tuning, ex.
+                                                   concurrency, chunksize &
+                                                   threads (optional)
+            callback    (func):                    Progress callback, called
+                                                   with bytes transferred
+                                                   since the previous call
+                                                   (optional)
+            credentials (dict):                    Optional source connection
+                                                   credentials
 
         Returns:
             Handle to target file """
+    src, tgt = _download_pair(source, target)
+    src.connect(**credentials)
+    return src.download(tgt, config=config, callback=callback)
+
+
+def download_many(pairs, workers=8, skip=True, config=None, callback=None,
+                  **credentials):
+    """ Download many source URIs concurrently. Transfers to the same host
+        on the same worker thread share one pooled connection.
+
+        Arguments:
+            pairs       (iterable):                Source URIs or (source,
+                                                   target) URI pairs
+            workers     (int):                     Number of concurrent
+                                                   transfers
+            skip        (bool):                    Skip targets that already
+                                                   hold the source contents
+            config      (TransferConfig or dict):  Transfer tuning applied to
+                                                   each download (optional)
+            callback    (func):                    Progress callback, called
+                                                   with bytes transferred
+                                                   since the previous call
+                                                   (optional)
+            credentials (dict):                    Optional source connection
+                                                   credentials
+
+        Returns:
+            List of DownloadResult of source URI, target URI, status &
+            error, in the order of pairs """
+    def transfer(pair):
+        """ Download a single pair, capturing errors. """
+        source, target = (pair, None) if isinstance(pair, str) else pair
+        target = target or _download_target(source)
+        try:
+            src, tgt = _download_pair(source, target)
+            with src:
+                src.connect(**credentials)
+                if skip and src.synced(tgt):
+                    return DownloadResult(source, target, 'skipped', None)
+                src.download(tgt, config=config, callback=callback)
+            return DownloadResult(source, target, 'downloaded', None)
+        except Exception as err:  # pylint: disable=broad-except
+            return DownloadResult(source, target, 'failed', err)
+
+    with futures.ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(transfer, pairs))
+
+
+class _Progress(object):
+    """ Readable wrapper reporting bytes read to a callback. """
+
+    def __init__(self, stream, callback=None):
+        self.stream = stream
+        self.callback = callback
+
+    def read(self, *size):
+        """ Read from the wrapped stream. """
+        chunk = self.stream.read(*size)
+        if chunk and self.callback is not None:
+            self.callback(len(chunk))
+        return chunk
+
+
+def _copy_local(src, tgt, config, callback):
+    """ Copy between local files in the kernel with copy_file_range, or
+        sendfile on Linux, falling back to a buffered copy if the kernel
+        copy fails or copies nothing before any bytes are written (ex.
+        pseudo-files reporting a size of zero). """
+    kernel = getattr(os, 'copy_file_range', None)
+    if kernel is None and sys.platform.startswith('linux') \
+            and hasattr(os, 'sendfile'):
+        kernel = _sendfile
+    with io.open(src.path, 'rb') as fsrc, io.open(tgt.path, 'wb') as ftgt:
+        copied = 0
+        while kernel is not None:
+            try:
+                sent = kernel(fsrc.fileno(), ftgt.fileno(), config.chunksize)
+            except OSError:
+                if copied:
+                    raise
+                break
+            if not sent:
+                if copied:
+                    return
+                break
+            copied += sent
+            if callback is not None:
+                callback(sent)
+        while True:
+            chunk = fsrc.read(config.chunksize)
+            if not chunk:
+                return
+            ftgt.write(chunk)
+            if callback is not None:
+                callback(len(chunk))
+
+
+def _sendfile(fsrc, ftgt, count):
+    """ Linux sendfile with copy_file_range's argument order. """
+    return os.sendfile(ftgt, fsrc, None, count)
+
+
+def _download_pair(source, target=None):
+    """ Open & validate a download source and target. """
     src = open(source)
     if not isinstance(src, furifile.RemoteFile):
         raise exceptions.DownloadError("Cannot download from non-RemoteFile.")
 
-    src.connect(**credentials)
-    tgt = open(target or os.path.expanduser(
-        "~/Downloads/%s" % src.filename), mode='r+')
+    tgt = open(target or _download_target(source), mode='r+')
 
     if isinstance(tgt, furifile.RemoteFile):
         raise exceptions.DownloadError(
             "Cannot download RemoteFile to other RemoteFile. Use local URI.")
 
-    return src.download(tgt)
+    return src, tgt
+
+
+def _download_target(source):
+    """ Default local download target URI for source. """
+    return os.path.expanduser(
+        "~/Downloads/%s" % os.path.basename(urlparse(source).path))
 
 
 def extfunc(ext):
-    """ Helper to get reader function for file extension. """
-    try:
-        return __extdispatch__[ext]
-    except KeyError:
-        raise exceptions.ExtensionError(
-            "Unsupported file extension: '%s'" % ext)
+    """ Helper to get reader function for file extension. Compound
+        extensions, ex. '.tar.json.gz', resolve to the longest registered
+        suffix. """
+    suffix = ext
+    while suffix:
+        try:
+            return __extdispatch__[suffix]
+        except KeyError:
+            index = suffix.find('.', 1)
+            suffix = suffix[index:] if index > 0 else ''
+    raise exceptions.ExtensionError(
+        "Unsupported file extension: '%s'" % ext)
 
 
 __dispatch__ = {
@@ -115,7 +339,15 @@ __dispatch__ = {
 __mapdispatch__ = {}
 
 
+__copydispatch__ = {
+    ('file', 'file'): _copy_local}
+
+
 __extdispatch__ = {
-    '.json': json.loads,
-    '.yaml': yaml.load,
-    '.yml': yaml.load}
+    '.env': parsers.load_env,
+    '.ini': parsers.load_ini,
+    '.json': parsers.load_json,
+    '.json.gz': parsers.load_json_gz,
+    '.toml': parsers.load_toml,
+    '.yaml': parsers.load_yaml,
+    '.yml': parsers.load_yaml}
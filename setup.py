@@ -6,11 +6,12 @@ setup(
     description='File access through URIs',
     extras_require={
         'aws': ['boto3 >= 1.2.3'],
-        'sftp': ['pysftp >= 0.2.8'],
+        'sftp': ['paramiko >= 3.3', 'pysftp >= 0.2.8'],
     },
     install_requires=['pyyaml >= 3.11.0'],
     name='furi',
     packages=['furi'],
+    python_requires='>=3.7',
     setup_requires=['setuptools_scm'],
     url='https://github.com/amancevice/furi',
     use_scm_version=True,
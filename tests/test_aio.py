@@ -0,0 +1,114 @@
+""" fURI asyncio Tests. """
+import asyncio
+import json
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import boto3
+import moto
+import pytest
+
+import furi
+
+
+def test_aopen_read():
+    async def read():
+        async with await furi.aopen(__file__) as furifile:
+            return await furifile.read()
+    with open(__file__, 'r') as this:
+        assert asyncio.run(read()) == this.read()
+
+
+def test_aexists():
+    assert asyncio.run(furi.aexists(__file__))
+    assert not asyncio.run(furi.aexists('/foo/bar/fizz/buzz'))
+
+
+def test_aiter():
+    async def lines():
+        furifile = await furi.aopen(__file__)
+        return [x async for x in furifile]
+    with open(__file__, 'r') as this:
+        assert asyncio.run(lines()) == list(this)
+
+
+def test_aiter_batched(tmpdir):
+    tmpdir.join("lines.txt").write("".join("%d\n" % i for i in range(5000)))
+
+    async def lines():
+        furifile = await furi.aopen(str(tmpdir.join("lines.txt")))
+        with mock.patch("furi.aio.run", wraps=furi.aio.run) as mock_run:
+            returned = [x async for x in furifile]
+        return returned, mock_run.call_count
+    returned, calls = asyncio.run(lines())
+    assert returned == ["%d\n" % i for i in range(5000)]
+    assert calls <= 10
+
+
+def test_aiterlines(tmpdir):
+    tmpdir.join("lines.txt").write_binary(b"fizz\r\nbuzz\n")
+
+    async def lines():
+        furifile = await furi.aopen(str(tmpdir.join("lines.txt")), mode="rb")
+        return [x async for x in furifile.iterlines(encoding="utf-8")]
+    assert asyncio.run(lines()) == ["fizz\n", "buzz\n"]
+
+
+def test_awalk(tmpdir):
+    for path in ['fizz.txt', 'buzz/jazz.txt']:
+        tmpdir.join(path).ensure()
+
+    async def walk():
+        return [x async for x in furi.awalk(str(tmpdir))]
+    assert asyncio.run(walk()) == list(furi.walk(str(tmpdir)))
+
+
+def test_aglob(tmpdir):
+    for path in ['2026/01/part-1.gz', '2026/01/other.gz', '2026/02/part-1.gz']:
+        tmpdir.join(path).ensure()
+
+    async def glob():
+        pattern = str(tmpdir.join('2026/*/part-*.gz'))
+        return [x async for x in furi.aglob(pattern)]
+    assert asyncio.run(glob()) == \
+        [str(tmpdir.join('2026/01/part-1.gz')),
+         str(tmpdir.join('2026/02/part-1.gz'))]
+
+
+def test_amap(tmpdir):
+    tmpdir.join('map.json').write(json.dumps({'fizz': 'buzz', 'jazz': 'fuzz'}))
+
+    async def lookup():
+        furimap = await furi.amap(str(tmpdir.join('map.json')))
+        return (await furimap['fizz'],
+                await furimap.get('buzz', 'default'),
+                await furimap.get_many(['fizz', 'jazz', 'buzz']),
+                await furimap.length())
+    assert asyncio.run(lookup()) == \
+        ('buzz', 'default', {'fizz': 'buzz', 'jazz': 'fuzz'}, 2)
+
+
+def test_amap_keyerr(tmpdir):
+    tmpdir.join('map.json').write(json.dumps({'fizz': 'buzz'}))
+
+    async def lookup():
+        furimap = await furi.amap(str(tmpdir.join('map.json')))
+        return await furimap['buzz']
+    with pytest.raises(KeyError):
+        asyncio.run(lookup())
+
+
+def test_aopen_s3():
+    furi.close_all()
+    with moto.mock_aws():
+        s3 = boto3.resource("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="furi").put_object(Key="fizz", Body=b"buzz")
+
+        async def read():
+            furifile = await furi.aopen("s3://furi/fizz",
+                                        region_name="us-east-1")
+            return await asyncio.gather(furifile.read(), furifile.exists())
+        assert asyncio.run(read()) == [b"buzz", True]
+    furi.close_all()
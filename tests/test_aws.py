@@ -0,0 +1,568 @@
+""" fURI AWS Tests. """
+import tempfile
+import time
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import boto3
+import moto
+import pytest
+
+import furi
+
+
+@pytest.fixture
+def bucket():
+    furi.close_all()
+    with moto.mock_aws():
+        s3 = boto3.resource("s3", region_name="us-east-1")
+        yield s3.create_bucket(Bucket="furi")
+    furi.close_all()
+
+
+def test_s3_read_changed(bucket):
+    bucket.put_object(Key="map.json", Body=b'{"fizz": "buzz"}')
+    s3file = furi.open("s3://furi/map.json", region_name="us-east-1")
+    tag, returned = s3file.read_changed()
+    assert returned == b'{"fizz": "buzz"}'
+    assert s3file.read_changed(tag) == (tag, None)
+
+
+def test_s3_read_changed_not_found(bucket):
+    s3file = furi.open("s3://furi/map.json", region_name="us-east-1")
+    with pytest.raises(furi.exceptions.FuriFileNotFoundError):
+        s3file.read_changed()
+
+
+def test_s3_map_revalidates(bucket):
+    bucket.put_object(Key="map.json", Body=b'{"fizz": "buzz"}')
+    furimap = furi.map("s3://furi/map.json", region_name="us-east-1")
+    assert furimap["fizz"] == "buzz"
+    bucket.put_object(Key="map.json", Body=b'{"fizz": "buzzing"}')
+    assert furimap["fizz"] == "buzzing"
+
+
+def test_s3_iterlines(bucket):
+    bucket.put_object(Key="log", Body=b"fizz\nbuzz\n" * 100)
+    s3file = furi.open("s3://furi/log", region_name="us-east-1")
+    assert list(s3file) == [b"fizz\n", b"buzz\n"] * 100
+    assert list(s3file.iterlines(chunksize=7, encoding="utf8")) == \
+        [u"fizz\n", u"buzz\n"] * 100
+
+
+def test_s3_reader_seek(bucket):
+    value = bytes(bytearray(range(256))) * 4
+    bucket.put_object(Key="blob", Body=value)
+    reader = furi.aws.S3Reader(
+        bucket.meta.client, "furi", "blob", blocksize=64, maxblocks=4)
+    reader.seek(-8, 2)
+    assert reader.read(8) == value[-8:]
+    reader.seek(100)
+    assert reader.read(50) == value[100:150]
+    assert len(reader.__blocks__) <= 4
+    reader.seek(10)
+    assert reader.read(900) == value[10:910]
+    assert reader.read() == value[910:]
+
+
+def test_s3_reader_readahead(bucket):
+    value = bytes(bytearray(range(256))) * 4
+    bucket.put_object(Key="blob", Body=value)
+    reader = furi.aws.S3Reader(
+        bucket.meta.client, "furi", "blob", blocksize=64, maxblocks=4)
+    assert reader.read(64) == value[:64]
+    assert reader.read(256) == value[64:320]
+    assert reader.read(64) == value[320:384]
+    assert len(reader.__blocks__) <= 4
+
+
+def test_s3_reader_ranges(bucket):
+    value = b"x" * 1024
+    bucket.put_object(Key="blob", Body=value)
+    client = bucket.meta.client
+    reader = furi.aws.S3Reader(client, "furi", "blob", blocksize=64)
+    with mock.patch.object(client, "get_object", wraps=client.get_object) \
+            as mock_get:
+        reader.seek(512)
+        reader.read(10)
+        reader.read(10)
+        assert mock_get.call_count == 1
+        assert mock_get.call_args[1]["Range"] == "bytes=512-575"
+
+
+def test_s3_read(bucket):
+    value = b"Hello, world!\n\nGoodbye, cruel world."
+    bucket.put_object(Key="foo/bar", Body=value)
+    s3file = furi.open("s3://furi/foo/bar", region_name="us-east-1")
+    assert s3file.read(5) == value[:5]
+    assert s3file.read() == value
+    assert list(s3file) == value.splitlines(True)
+
+
+def test_s3_write(bucket):
+    value = "Hello, world!\n\nGoodbye, cruel world."
+    s3file = furi.open("s3://furi/foo/bar", region_name="us-east-1")
+    s3file.write(value)
+    assert bucket.Object("foo/bar").get()["Body"].read() == value.encode()
+
+
+def test_s3_write_multipart(bucket):
+    partsize = 5 * 1024 * 1024
+    chunk = b"x" * (1024 * 1024)
+    with furi.open("s3://furi/foo/big", mode="w", partsize=partsize,
+                   region_name="us-east-1") as s3file:
+        for _ in range(11):
+            s3file.write(chunk)
+        assert len(s3file.stream().__buffer__) < partsize
+    obj = bucket.Object("foo/big")
+    assert obj.content_length == 11 * len(chunk)
+    assert "-3" in obj.e_tag
+
+
+def test_s3_write_abort(bucket):
+    client = bucket.meta.client
+    partsize = furi.aws.S3Writer.__partmin__
+    writer = furi.aws.S3Writer(client, "furi", "foo/bad", partsize=partsize)
+    with mock.patch.object(client, "upload_part", side_effect=ValueError):
+        with pytest.raises(ValueError):
+            writer.write(b"x" * (2 * partsize))
+            writer.close()
+    assert writer.closed
+    assert "Uploads" not in client.list_multipart_uploads(Bucket="furi")
+    assert "Contents" not in client.list_objects_v2(Bucket="furi")
+
+
+def test_s3_partsize_err(bucket):
+    with pytest.raises(ValueError):
+        furi.open("s3://furi/foo/bar", mode="w", partsize=1024,
+                  region_name="us-east-1")
+    with pytest.raises(ValueError):
+        furi.aws.S3Writer(bucket.meta.client, "furi", "foo/bar", partsize=5)
+
+
+def test_s3_download(bucket):
+    value = b"x" * (1024 * 1024)
+    bucket.put_object(Key="foo/bar", Body=value)
+    progress = []
+    config = {"concurrency": 4, "chunksize": 256 * 1024}
+    with tempfile.NamedTemporaryFile() as tmp:
+        target = furi.download("s3://furi/foo/bar", tmp.name, config=config,
+                               callback=progress.append,
+                               region_name="us-east-1")
+        assert target.path == tmp.name
+        assert open(tmp.name, "rb").read() == value
+    assert sum(progress) == len(value)
+
+
+def test_s3_download_many(bucket, tmpdir):
+    for name in ("fizz", "buzz", "jazz"):
+        bucket.put_object(Key="foo/%s" % name, Body=name.encode())
+    tmpdir.join("jazz").write("jazz")
+    pairs = [("s3://furi/foo/%s" % x, str(tmpdir.join(x)))
+             for x in ("fizz", "buzz", "jazz", "missing")]
+    connect = furi.aws.S3File._connect
+    with mock.patch.object(furi.aws.S3File, "_connect", autospec=True,
+                           side_effect=connect) as mock_connect:
+        results = furi.download_many(pairs, workers=4, region_name="us-east-1")
+        assert 1 <= mock_connect.call_count <= 4
+    returned = [(x.source, x.status) for x in results]
+    expected = [
+        ("s3://furi/foo/fizz", "downloaded"),
+        ("s3://furi/foo/buzz", "downloaded"),
+        ("s3://furi/foo/jazz", "skipped"),
+        ("s3://furi/foo/missing", "failed")]
+    assert returned == expected
+    assert [x.target for x in results] == [x[1] for x in pairs]
+    assert results[-1].error is not None
+    assert tmpdir.join("buzz").read() == "buzz"
+
+
+def test_s3_pooled(bucket):
+    fizz = furi.open("s3://furi/fizz", region_name="us-east-1")
+    buzz = furi.open("s3://other/buzz", region_name="us-east-1")
+    jazz = furi.open("s3://furi/jazz", region_name="us-west-2")
+    assert fizz.connection is buzz.connection
+    assert fizz.connection is not jazz.connection
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_s3_walk(bucket, workers):
+    keys = ["foo/baq/bug", "foo/bar/bizz/buzz", "foo/bar/bizz/fizz", "foo/ban"]
+    for key in keys:
+        bucket.put_object(Key=key, Body=b"Hello, world!")
+    s3file = furi.open("s3://furi/foo", region_name="us-east-1")
+    returned = list(s3file.walk(workers=workers))
+    expected = [
+        ("s3://furi/foo/", ["baq", "bar"], ["ban"]),
+        ("s3://furi/foo/baq/", [], ["bug"]),
+        ("s3://furi/foo/bar/", ["bizz"], []),
+        ("s3://furi/foo/bar/bizz/", [], ["buzz", "fizz"])]
+    assert returned == expected
+
+
+def test_s3_walk_lazy(bucket):
+    for key in ["foo/bar/fizz", "foo/baz/buzz"]:
+        bucket.put_object(Key=key, Body=b"Hello, world!")
+    client = bucket.meta.client
+    s3file = furi.open("s3://furi/foo/", region_name="us-east-1")
+    with mock.patch.object(s3file.connection.meta.client, "list_objects_v2",
+                           wraps=client.list_objects_v2) as mock_list:
+        walker = s3file.walk()
+        next(walker)
+        assert mock_list.call_count == 1
+        assert mock_list.call_args[1]["Delimiter"] == "/"
+
+
+def test_s3_glob(bucket):
+    keys = ["logs/2026/01/part-1.gz", "logs/2026/01/other.gz",
+            "logs/2026/02/part-1.gz", "logs/2025/01/part-1.gz"]
+    for key in keys:
+        bucket.put_object(Key=key, Body=b"Hello, world!")
+    pattern = "s3://furi/logs/2026/*/part-*.gz"
+    s3file = furi.open("s3://furi/", region_name="us-east-1")
+    client = s3file.connection.meta.client
+    with mock.patch.object(client, "list_objects_v2",
+                           wraps=client.list_objects_v2) as mock_list:
+        returned = furi.glob(pattern, region_name="us-east-1")
+        prefixes = [x[1]["Prefix"] for x in mock_list.call_args_list]
+    assert returned == [
+        "s3://furi/logs/2026/01/part-1.gz", "s3://furi/logs/2026/02/part-1.gz"]
+    assert prefixes == [
+        "logs/2026/", "logs/2026/01/part-", "logs/2026/02/part-"]
+
+
+def test_s3_stat(bucket):
+    bucket.put_object(Key="foo/bar.json", Body=b"{}",
+                      ContentType="application/json")
+    s3file = furi.open("s3://furi/foo/bar.json", region_name="us-east-1")
+    client = s3file.connection.meta.client
+    with mock.patch.object(client, "head_object",
+                           wraps=client.head_object) as mock_head:
+        assert s3file.exists()
+        stat = s3file.stat()
+        assert s3file.read() == b"{}"
+        assert mock_head.call_count == 1
+    assert stat.size == 2
+    assert stat.etag == bucket.Object("foo/bar.json").e_tag
+    assert stat.content_type == "application/json"
+
+
+def test_s3_stat_invalidated(bucket):
+    s3file = furi.open("s3://furi/foo/bar", region_name="us-east-1")
+    assert not s3file.exists()
+    s3file.write("Hello, world!")
+    assert s3file.exists()
+    assert s3file.stat().size == 13
+
+
+@pytest.fixture
+def table():
+    with moto.mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb.create_table(
+            TableName="furi",
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "id",
+                                   "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST")
+        with table.batch_writer() as batch:
+            for i in range(250):
+                batch.put_item(
+                    Item={"id": "key%03d" % i, "fizz": i, "buzz": "x" * i})
+        yield table
+
+
+def test_dynamo_get_many(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    keys = ["key%03d" % i for i in range(0, 250, 2)] + ["missing"]
+    returned = dynamomap.get_many(keys, workers=2)
+    assert sorted(returned) == sorted(keys[:-1])
+    assert returned["key010"] == {"id": "key010", "fizz": 10, "buzz": "x" * 10}
+
+
+def test_dynamo_get_many_projection(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    returned = dynamomap.get_many(["key001", "key002"], projection=["fizz"])
+    assert returned == {"key001": {"id": "key001", "fizz": 1},
+                        "key002": {"id": "key002", "fizz": 2}}
+
+
+def test_dynamo_get_many_unprocessed(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    client = dynamomap.connection.meta.client
+    batch_get_item = client.batch_get_item
+
+    def throttled(RequestItems):
+        keys = RequestItems["furi"]["Keys"]
+        if len(keys) > 1:
+            unprocessed = dict(RequestItems["furi"], Keys=keys[1:])
+            response = batch_get_item(
+                RequestItems={"furi": dict(RequestItems["furi"],
+                                           Keys=keys[:1])})
+            response["UnprocessedKeys"] = {"furi": unprocessed}
+            return response
+        return batch_get_item(RequestItems=RequestItems)
+
+    with mock.patch.object(client, "batch_get_item", side_effect=throttled), \
+            mock.patch("time.sleep") as mock_sleep:
+        returned = dynamomap.get_many(["key001", "key002", "key003"])
+    assert sorted(returned) == ["key001", "key002", "key003"]
+    assert mock_sleep.call_count == 2
+
+
+def test_dynamo_setitem(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    dynamomap["key001"] = {"jazz": "hands"}
+    dynamomap["new"] = {"fizz": 1}
+    dynamomap["empty"] = {}
+    assert dynamomap["key001"] == {
+        "id": "key001", "fizz": 1, "buzz": "x", "jazz": "hands"}
+    assert dynamomap["new"] == {"id": "new", "fizz": 1}
+    assert dynamomap["empty"] == {"id": "empty"}
+    del dynamomap["new"]
+    with pytest.raises(KeyError):
+        dynamomap["new"]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_dynamo_batch(table, workers):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    client = dynamomap.connection.meta.client
+    with mock.patch.object(client, "batch_write_item",
+                           wraps=client.batch_write_item) as mock_write:
+        with dynamomap.batch(workers=workers) as batch:
+            for i in range(60):
+                batch["new%03d" % i] = {"fizz": i}
+            batch["new000"] = {"fizz": "buzz"}
+            del batch["key000"]
+        assert mock_write.call_count == 3
+    assert dynamomap["new000"] == {"id": "new000", "fizz": "buzz"}
+    assert dynamomap["new059"] == {"id": "new059", "fizz": 59}
+    with pytest.raises(KeyError):
+        dynamomap["key000"]
+
+
+def test_dynamo_batch_key_order(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    batch_write = dynamomap._batch_write
+
+    def slow_first(requests):
+        if any(x["PutRequest"]["Item"].get("fizz") == "first"
+               for x in requests):
+            time.sleep(0.3)
+        return batch_write(requests)
+
+    with mock.patch.object(dynamomap, "_batch_write", side_effect=slow_first):
+        with dynamomap.batch(workers=4) as batch:
+            for value in ["first", "second"]:
+                batch["hot"] = {"fizz": value}
+                for i in range(24):
+                    batch["%s%03d" % (value, i)] = {"fizz": i}
+    assert dynamomap["hot"] == {"id": "hot", "fizz": "second"}
+
+
+def test_dynamo_update_many(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    dynamomap.update_many(dict(("new%03d" % i, {"fizz": i})
+                               for i in range(100)))
+    assert len(dynamomap.get_many(["new%03d" % i for i in range(100)])) == 100
+
+
+@pytest.mark.parametrize("segments", [1, 4])
+def test_dynamo_scan(table, segments):
+    dynamomap = furi.map("dynamodb://furi/", segments=segments,
+                         region_name="us-east-1")
+    returned = sorted(x["id"] for x in dynamomap)
+    expected = ["key%03d" % i for i in range(250)]
+    assert returned == expected
+
+
+def test_dynamo_scan_projection(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    client = dynamomap.connection.meta.client
+    with mock.patch.object(client, "scan", wraps=client.scan) as mock_scan:
+        items = list(dynamomap.scan(segments=2, projection=["id"], limit=50))
+    assert len(items) == 250
+    assert all(list(x) == ["id"] for x in items)
+    assert mock_scan.call_count >= 5
+
+
+def test_dynamo_keys(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    assert sorted(dynamomap.keys(segments=2)) == \
+        ["key%03d" % i for i in range(250)]
+
+
+def test_dynamo_chain(table, tmpdir):
+    tmpdir.join("map.json").write('{"fizz": "buzz", "key000": "file"}')
+    chainmap = furi.chain(furi.map(str(tmpdir.join("map.json"))),
+                          furi.map("dynamodb://furi/", region_name="us-east-1"))
+    assert chainmap["key000"] == "file"
+    assert chainmap["key001"]["fizz"] == 1
+    returned = list(chainmap)
+    assert returned[:2] == ["fizz", "key000"]
+    assert sorted(returned[2:]) == ["key%03d" % i for i in range(1, 250)]
+    assert len(chainmap) == 251
+
+
+def test_dynamo_scan_early_exit(table):
+    dynamomap = furi.map("dynamodb://furi/", region_name="us-east-1")
+    scan = dynamomap.scan(segments=4, limit=1, queuesize=1)
+    assert next(scan)
+    scan.close()
+
+
+def test_dynamo_cache(table):
+    dynamomap = furi.map("dynamodb://furi/", cachesize=10,
+                         region_name="us-east-1")
+    with mock.patch.object(dynamomap.table, "get_item",
+                           wraps=dynamomap.table.get_item) as mock_get:
+        assert dynamomap["key001"]["fizz"] == 1
+        assert dynamomap["key001"]["fizz"] == 1
+        with pytest.raises(KeyError):
+            dynamomap["missing"]
+        with pytest.raises(KeyError):
+            dynamomap["missing"]
+        assert mock_get.call_count == 2
+    assert (dynamomap.cache.hits, dynamomap.cache.misses) == (2, 2)
+
+
+def test_dynamo_cache_invalidated(table):
+    dynamomap = furi.map("dynamodb://furi/", cachesize=10,
+                         region_name="us-east-1")
+    assert dynamomap["key001"]["fizz"] == 1
+    dynamomap["key001"] = {"fizz": 2}
+    assert dynamomap["key001"]["fizz"] == 2
+    with dynamomap.batch() as batch:
+        batch["key001"] = {"fizz": 3}
+    assert dynamomap["key001"]["fizz"] == 3
+    del dynamomap["key001"]
+    with pytest.raises(KeyError):
+        dynamomap["key001"]
+
+
+def test_dynamo_cache_get_many(table):
+    dynamomap = furi.map("dynamodb://furi/", cachesize=10,
+                         region_name="us-east-1")
+    dynamomap.get_many(["key001", "missing"])
+    client = dynamomap.connection.meta.client
+    with mock.patch.object(client, "batch_get_item") as mock_batch:
+        assert dynamomap.get_many(["key001", "missing"]) == {
+            "key001": {"id": "key001", "fizz": 1, "buzz": "x"}}
+        assert mock_batch.call_count == 0
+
+
+@pytest.mark.parametrize("strategy", ["approximate", "exact", "cached"])
+def test_dynamo_len(table, strategy):
+    dynamomap = furi.map("dynamodb://furi/", segments=4, count=strategy,
+                         region_name="us-east-1")
+    assert len(dynamomap) == 250
+
+
+def test_dynamo_count_cached(table):
+    dynamomap = furi.map("dynamodb://furi/", count="cached",
+                         region_name="us-east-1")
+    client = dynamomap.connection.meta.client
+    with mock.patch.object(client, "scan", wraps=client.scan) as mock_scan:
+        assert len(dynamomap) == 250
+        del dynamomap["key000"]
+        assert len(dynamomap) == 250
+        assert dynamomap.count("exact") == 249
+        assert all(x[1]["Select"] == "COUNT"
+                   for x in mock_scan.call_args_list)
+        assert mock_scan.call_count == 2
+
+
+def test_dynamo_count_err(table):
+    with pytest.raises(ValueError):
+        furi.map("dynamodb://furi/", count="fuzzy", region_name="us-east-1")
+
+
+def test_s3_disk_cache(bucket, tmpdir):
+    bucket.put_object(Key="fizz.txt", Body=b"buzz")
+    diskcache = furi.cache.DiskCache(str(tmpdir.join("cache")))
+    s3file = furi.open("s3://furi/fizz.txt", region_name="us-east-1",
+                       diskcache=diskcache)
+    client = s3file.connection.meta.client
+    with mock.patch.object(client, "download_file",
+                           wraps=client.download_file) as mock_download:
+        assert s3file.read() == b"buzz"
+        assert furi.open("s3://furi/fizz.txt", region_name="us-east-1",
+                         diskcache=diskcache).read() == b"buzz"
+        assert mock_download.call_count == 1
+        bucket.put_object(Key="fizz.txt", Body=b"jazz")
+        s3file = furi.open("s3://furi/fizz.txt", region_name="us-east-1",
+                           diskcache=diskcache)
+        assert s3file.read() == b"jazz"
+        s3file.download(furi.open(str(tmpdir.join("local.txt"))))
+        assert mock_download.call_count == 2
+    assert tmpdir.join("local.txt").read() == "jazz"
+    bucket.delete_objects(Delete={"Objects": [{"Key": "fizz.txt"}]})
+    diskcache.offline = True
+    assert furi.open("s3://furi/fizz.txt", region_name="us-east-1",
+                     diskcache=diskcache).read() == b"jazz"
+
+
+def test_s3_disk_cache_download_miss(bucket, tmpdir):
+    bucket.put_object(Key="blob", Body=b"x" * 2000)
+    diskcache = furi.cache.DiskCache(str(tmpdir.join("cache")))
+    s3file = furi.open("s3://furi/blob", region_name="us-east-1",
+                       diskcache=diskcache)
+    config = furi.TransferConfig(concurrency=2, chunksize=1000)
+    sent = []
+    with mock.patch.object(type(s3file), "_download",
+                           autospec=True,
+                           side_effect=type(s3file)._download) as mock_dl:
+        s3file.download(furi.open(str(tmpdir.join("local"))), config=config,
+                        callback=sent.append)
+    assert mock_dl.call_args[0][2] is config
+    assert sum(sent) == 2000
+    assert tmpdir.join("local").read_binary() == b"x" * 2000
+
+
+def test_s3_map_offline(bucket, tmpdir):
+    bucket.put_object(Key="map.json", Body=b'{"fizz": "buzz"}')
+    diskcache = furi.cache.DiskCache(str(tmpdir))
+    assert furi.open("s3://furi/map.json", region_name="us-east-1",
+                     diskcache=diskcache).read() == b'{"fizz": "buzz"}'
+    diskcache.offline = True
+    furimap = furi.map("s3://furi/map.json", region_name="us-east-1",
+                       diskcache=diskcache)
+    with mock.patch.object(furimap.source, "_read_changed") as mock_read:
+        assert furimap["fizz"] == "buzz"
+        assert furimap["fizz"] == "buzz"
+        assert mock_read.call_count == 0
+
+
+def test_s3_disk_cache_oversized(bucket, tmpdir):
+    bucket.put_object(Key="blob", Body=b"x" * 2000)
+    diskcache = furi.cache.DiskCache(str(tmpdir), maxsize=1000)
+    s3file = furi.open("s3://furi/blob", region_name="us-east-1",
+                       diskcache=diskcache)
+    client = s3file.connection.meta.client
+    with mock.patch.object(client, "download_file",
+                           wraps=client.download_file) as mock_download:
+        assert s3file.read() == b"x" * 2000
+        assert mock_download.call_count == 1
+
+
+def test_s3_copy(bucket, tmpdir):
+    bucket.put_object(Key="fizz", Body=b"buzz" * 1000)
+    sent = []
+    furi.copy("s3://furi/fizz", "s3://furi/copy/fizz", callback=sent.append,
+              region_name="us-east-1")
+    body = bucket.Object("copy/fizz").get()["Body"].read()
+    assert body == b"buzz" * 1000
+    assert sum(sent) == 4000
+
+
+def test_s3_copy_local(bucket, tmpdir):
+    tmpdir.join("fizz").write_binary(b"buzz" * 1000)
+    furi.copy(str(tmpdir.join("fizz")), "s3://furi/fizz",
+              region_name="us-east-1")
+    assert bucket.Object("fizz").get()["Body"].read() == b"buzz" * 1000
+    furi.copy("s3://furi/fizz", str(tmpdir.join("copy/fizz")),
+              region_name="us-east-1")
+    assert tmpdir.join("copy/fizz").read_binary() == b"buzz" * 1000
@@ -0,0 +1,114 @@
+""" fURI Cache Tests. """
+import os
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+import furi
+import furi.cache
+
+
+def test_get_set():
+    cache = furi.cache.LRUCache()
+    assert cache.get("fizz") == (False, None)
+    cache.set("fizz", "buzz")
+    assert cache.get("fizz") == (True, "buzz")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction():
+    cache = furi.cache.LRUCache(maxsize=2)
+    cache.set("fizz", 1)
+    cache.set("buzz", 2)
+    cache.get("fizz")
+    cache.set("jazz", 3)
+    assert cache.get("buzz") == (False, None)
+    assert cache.get("fizz") == (True, 1)
+
+
+def test_ttl():
+    cache = furi.cache.LRUCache(ttl=10)
+    with mock.patch("time.time", return_value=0):
+        cache.set("fizz", "buzz")
+    with mock.patch("time.time", return_value=5):
+        assert cache.get("fizz") == (True, "buzz")
+    with mock.patch("time.time", return_value=20):
+        assert cache.get("fizz") == (False, None)
+    assert len(cache) == 0
+
+
+def test_invalidate():
+    cache = furi.cache.LRUCache()
+    cache.set("fizz", "buzz")
+    cache.invalidate("fizz")
+    assert cache.get("fizz") == (False, None)
+
+
+def fill_with(value, calls):
+    def fill(path):
+        calls.append(path)
+        with open(path, 'wb') as local:
+            local.write(value)
+    return fill
+
+
+def test_disk_cache(tmpdir):
+    diskcache = furi.cache.DiskCache(str(tmpdir))
+    calls = []
+    with diskcache.open('s3://furi/fizz', 'v1',
+                        fill_with(b'buzz', calls)) as cached:
+        assert cached.read() == b'buzz'
+    with diskcache.open('s3://furi/fizz', 'v1',
+                        fill_with(b'nope', calls)) as cached:
+        assert cached.read() == b'buzz'
+    assert len(calls) == 1
+    assert [x for x in tmpdir.visit() if x.check(file=1)
+            and x.basename.startswith('.')] == []
+
+
+def test_disk_cache_version(tmpdir):
+    diskcache = furi.cache.DiskCache(str(tmpdir))
+    calls = []
+    diskcache.open('s3://furi/fizz', 'v1', fill_with(b'buzz', calls)).close()
+    with diskcache.open('s3://furi/fizz', 'v2',
+                        fill_with(b'jazz', calls)) as cached:
+        assert cached.read() == b'jazz'
+    assert len([x for x in tmpdir.visit() if x.check(file=1)]) == 1
+
+
+def test_disk_cache_offline(tmpdir):
+    diskcache = furi.cache.DiskCache(str(tmpdir), offline=True)
+    with pytest.raises(furi.exceptions.FuriFileNotFoundError):
+        diskcache.open('s3://furi/fizz')
+    diskcache.open('s3://furi/fizz', 'v1', fill_with(b'buzz', [])).close()
+    with diskcache.open('s3://furi/fizz') as cached:
+        assert cached.read() == b'buzz'
+
+
+def test_disk_cache_evict(tmpdir):
+    diskcache = furi.cache.DiskCache(str(tmpdir), maxsize=25)
+    for index in range(5):
+        uri = 's3://furi/%d' % index
+        diskcache.open(uri, 'v1', fill_with(b'x' * 10, [])).close()
+        os.utime(diskcache._path(uri, 'v1'), (index, index))
+        diskcache.open('s3://furi/0', 'v1', fill_with(b'x' * 10, [])).close()
+    sizes = [x.size() for x in tmpdir.visit() if x.check(file=1)]
+    assert sum(sizes) <= 25
+    with pytest.raises(furi.exceptions.FuriFileNotFoundError):
+        diskcache.open('s3://furi/3', 'v1')
+    diskcache.open('s3://furi/0', 'v1').close()
+
+
+def test_disk_cache_oversized(tmpdir):
+    diskcache = furi.cache.DiskCache(str(tmpdir), maxsize=25)
+    diskcache.open('s3://furi/fizz', 'v1', fill_with(b'x' * 10, [])).close()
+    calls = []
+    with diskcache.open('s3://furi/buzz', 'v1',
+                        fill_with(b'x' * 30, calls)) as cached:
+        assert cached.read() == b'x' * 30
+    assert len(calls) == 1
+    with pytest.raises(furi.exceptions.FuriFileNotFoundError):
+        diskcache.open('s3://furi/fizz', 'v1')
@@ -203,6 +203,25 @@ def test_iter():
     assert returned == lines
 
 
+def test_iterlines_chunked():
+    lines = [b"fizz\n", b"\n", b"buzz jazz fuzz\n", b"no newline"]
+    with tempfile.NamedTemporaryFile() as tmp:
+        tmp.write(b"".join(lines))
+        tmp.flush()
+        furifile = furi.open(tmp.name, mode="rb")
+        returned = list(furifile.iterlines(chunksize=3))
+    assert returned == lines
+
+
+def test_iterlines_decode():
+    with tempfile.NamedTemporaryFile() as tmp:
+        tmp.write(u"caf\u00e9\r\nna\u00efve\n".encode("utf8"))
+        tmp.flush()
+        furifile = furi.open(tmp.name, mode="rb")
+        returned = list(furifile.iterlines(chunksize=1, encoding="utf8"))
+    assert returned == [u"caf\u00e9\n", u"na\u00efve\n"]
+
+
 def test_cant_stream():
     with pytest.raises(furi.exceptions.FuriFileNotFoundError):
         furi.open("/path/to/file").stream()
@@ -245,3 +264,55 @@ def test__walk():
 def test__stream():
     with pytest.raises(NotImplementedError):
         furi.furifile.RemoteFile("s3://bucket/path/to/file")._stream()
+
+
+def test_transfer_config():
+    config = furi.TransferConfig.create({"concurrency": 2})
+    assert config.concurrency == 2
+    assert config.chunksize == furi.TransferConfig().chunksize
+    assert furi.TransferConfig.create(config) is config
+
+
+def test__listdir():
+    with pytest.raises(NotImplementedError):
+        furi.furifile.RemoteFile("s3://bucket/path/to/file")._listdir("/")
+
+
+def test_stat():
+    furifile = furi.open(__file__)
+    stat = furifile.stat()
+    assert stat.size == os.path.getsize(__file__)
+    assert stat.mtime == os.path.getmtime(__file__)
+    assert stat.content_type == "text/x-python"
+
+
+def test_stat_not_found():
+    with pytest.raises(furi.exceptions.FuriFileNotFoundError):
+        furi.open("/foo/bar/fizz/buzz").stat()
+
+
+def test_buffer(tmpdir):
+    tmpdir.join("blob").write_binary(b"fizz buzz")
+    tmpdir.join("empty").write_binary(b"")
+    buffer = furi.open(str(tmpdir.join("blob"))).buffer()
+    assert isinstance(buffer, memoryview)
+    assert buffer.readonly
+    assert buffer[5:] == b"buzz"
+    assert furi.open(str(tmpdir.join("empty"))).buffer() == b""
+
+
+def test_readinto(tmpdir):
+    tmpdir.join("blob").write_binary(b"fizz buzz")
+    buffer = bytearray(4)
+    furifile = furi.open(str(tmpdir.join("blob")), mode="rb")
+    assert furifile.readinto(buffer) == 4
+    assert buffer == b"fizz"
+
+
+def test_read_changed_buffer(tmpdir):
+    tmpdir.join("blob").write_binary(b"fizz buzz")
+    furifile = furi.open(str(tmpdir.join("blob")), mode="rb")
+    tag, returned = furifile.read_changed(buffer=True)
+    assert isinstance(returned, memoryview)
+    assert returned == b"fizz buzz"
+    assert furifile.read_changed(tag, buffer=True) == (tag, None)
@@ -1,6 +1,8 @@
 """ fURI Map Tests. """
 import json
+import os
 import tempfile
+import time
 try:
     from unittest import mock
 except ImportError:
@@ -63,3 +65,190 @@ def test_read(mock_ext):
         returned = furimap._read()
         expected = {"fizz": "buzz"}
         assert returned == expected
+
+
+def test_read_cached():
+    parser = mock.Mock(side_effect=json.loads)
+    with mock.patch("furi.utils.extfunc", return_value=parser):
+        with tempfile.NamedTemporaryFile(suffix=".json") as tmp:
+            tmp.write('{"fizz": "buzz"}'.encode("utf-8"))
+            tmp.flush()
+            furimap = furi.map(tmp.name)
+            assert furimap["fizz"] == "buzz"
+            assert dict(furimap) == {"fizz": "buzz"}
+            assert parser.call_count == 1
+
+
+def test_read_changed():
+    with tempfile.NamedTemporaryFile(suffix=".json") as tmp:
+        tmp.write('{"fizz": "buzz"}'.encode("utf-8"))
+        tmp.flush()
+        furimap = furi.map(tmp.name)
+        assert furimap["fizz"] == "buzz"
+        tmp.seek(0)
+        tmp.write('{"fizz": "buzzing"}'.encode("utf-8"))
+        tmp.flush()
+        assert furimap["fizz"] == "buzzing"
+
+
+def test_read_changed_replaced(tmpdir):
+    tmpdir.join("map.yml").write("fizz: buzz\n")
+    furimap = furi.map(str(tmpdir.join("map.yml")))
+    assert furimap["fizz"] == "buzz"
+    tmpdir.join("new.yml").write("fizz: buzzing\n")
+    os.replace(str(tmpdir.join("new.yml")), str(tmpdir.join("map.yml")))
+    assert furimap["fizz"] == "buzzing"
+
+
+def test_read_ttl():
+    with tempfile.NamedTemporaryFile(suffix=".json") as tmp:
+        tmp.write('{"fizz": "buzz"}'.encode("utf-8"))
+        tmp.flush()
+        furimap = furi.map(tmp.name, ttl=None)
+        assert furimap["fizz"] == "buzz"
+        tmp.seek(0)
+        tmp.write('{"fizz": "buzzing"}'.encode("utf-8"))
+        tmp.flush()
+        assert furimap["fizz"] == "buzz"
+        furimap.invalidate()
+        assert furimap["fizz"] == "buzzing"
+
+
+def test_snapshot_revision(tmpdir):
+    tmpdir.join("map.json").write('{"fizz": "buzz"}')
+    furimap = furi.map(str(tmpdir.join("map.json")))
+    assert furimap.snapshot() == (1, {"fizz": "buzz"})
+    assert furimap.snapshot()[0] == 1
+    tmpdir.join("map.json").write('{"fizz": "buzzing"}')
+    assert furimap.snapshot() == (2, {"fizz": "buzzing"})
+
+
+def test_chain(tmpdir):
+    tmpdir.join("a.json").write('{"fizz": "buzz"}')
+    tmpdir.join("b.json").write('{"fizz": "fuzz", "jazz": "razz"}')
+    tmpdir.join("c.json").write('{"jazz": "nope", "tazz": "wazz"}')
+    parser = mock.Mock(side_effect=json.loads)
+    with mock.patch("furi.utils.extfunc", return_value=parser):
+        chainmap = furi.chain(*[furi.map(str(tmpdir.join(x)))
+                                for x in ["a.json", "b.json", "c.json"]],
+                              ttl=0)
+        assert chainmap["tazz"] == "wazz"
+        assert chainmap["jazz"] == "razz"
+        assert chainmap["fizz"] == "buzz"
+        assert parser.call_count == 3
+        assert sorted(chainmap) == ["fizz", "jazz", "tazz"]
+        assert len(chainmap) == 3
+        assert parser.call_count == 3
+        tmpdir.join("a.json").write('{"fizz": "buzz", "tazz": "first"}')
+        assert chainmap["tazz"] == "first"
+        assert parser.call_count == 4
+    with pytest.raises(KeyError):
+        chainmap["missing"]
+
+
+def test_chain_ttl(tmpdir):
+    tmpdir.join("a.json").write('{"fizz": "buzz"}')
+    furimap = furi.map(str(tmpdir.join("a.json")))
+    with mock.patch("time.time", return_value=0):
+        chainmap = furi.chain(furimap, ttl=10)
+        assert chainmap["fizz"] == "buzz"
+    with mock.patch.object(furimap, "snapshot",
+                           wraps=furimap.snapshot) as mock_snapshot:
+        with mock.patch("time.time", return_value=5):
+            assert chainmap["fizz"] == "buzz"
+            assert mock_snapshot.call_count == 0
+        tmpdir.join("a.json").write('{"fizz": "buzzing"}')
+        with mock.patch("time.time", return_value=20):
+            assert chainmap["fizz"] == "buzzing"
+            assert mock_snapshot.call_count == 1
+
+
+def test_chain_mixed(tmpdir):
+    tmpdir.join("b.json").write('{"fizz": "fuzz", "jazz": "razz"}')
+    chainmap = furi.chain(furi.map(str(tmpdir.join("missing.json"))),
+                          {"jazz": "dict"},
+                          furi.map(str(tmpdir.join("b.json"))))
+    assert chainmap["jazz"] == "dict"
+    assert chainmap["fizz"] == "fuzz"
+    assert list(chainmap) == ["jazz", "fizz"]
+    assert len(chainmap) == 2
+    with pytest.raises(KeyError):
+        chainmap["missing"]
+
+
+class SlowMap(dict):
+    def __getitem__(self, key):
+        time.sleep(0.2)
+        return super(SlowMap, self).__getitem__(key)
+
+
+def test_chain_concurrent():
+    chainmap = furi.chain(SlowMap(), SlowMap(fizz="second"),
+                          SlowMap(fizz="third"), SlowMap(), workers=4)
+    start = time.time()
+    assert chainmap["fizz"] == "second"
+    with pytest.raises(KeyError):
+        chainmap["buzz"]
+    assert time.time() - start < 0.7
+
+
+def test_chain_prefetch(tmpdir):
+    tmpdir.join("a.json").write('{"fizz": "buzz"}')
+    tmpdir.join("b.json").write('{"jazz": "razz"}')
+    parser = mock.Mock(side_effect=json.loads)
+    with mock.patch("furi.utils.extfunc", return_value=parser):
+        chainmap = furi.chain(furi.map(str(tmpdir.join("a.json"))),
+                              furi.map(str(tmpdir.join("b.json"))),
+                              workers=2, prefetch=True)
+        assert parser.call_count == 2
+        assert chainmap["jazz"] == "razz"
+        assert parser.call_count == 2
+
+
+def test_chain_kwargs_err():
+    with pytest.raises(TypeError):
+        furi.chain({}, worker=2)
+
+
+def test_read_buffered(tmpdir):
+    received = []
+
+    @furi.parsers.buffered
+    def parser(data):
+        received.append(type(data))
+        return json.loads(bytes(data))
+
+    tmpdir.join("map.buffered").write('{"fizz": "buzz"}')
+    furi.add_mapext(".buffered", parser)
+    try:
+        assert furi.map(str(tmpdir.join("map.buffered")))["fizz"] == "buzz"
+    finally:
+        del furi.utils.__extdispatch__[".buffered"]
+    assert received == [memoryview]
+
+
+def test_read_unbuffered_text(tmpdir):
+    received = []
+
+    def parser(data):
+        received.append(type(data))
+        return json.loads(data)
+
+    tmpdir.join("map.text").write('{"fizz": "buzz"}')
+    furi.add_mapext(".text", parser)
+    try:
+        assert furi.map(str(tmpdir.join("map.text")))["fizz"] == "buzz"
+        assert furi.map(str(tmpdir.join("map.text")), mode="rb")["fizz"] == \
+            "buzz"
+    finally:
+        del furi.utils.__extdispatch__[".text"]
+    assert received == [str, bytes]
+
+
+def test_chain_close():
+    with furi.chain(SlowMap(), SlowMap(fizz="second"),
+                    workers=2) as chainmap:
+        pool = chainmap.__pool__
+        assert chainmap["fizz"] == "second"
+    assert pool._shutdown
+    assert chainmap["fizz"] == "second"
@@ -0,0 +1,63 @@
+""" fURI Parser Tests. """
+import gzip
+import json
+
+import pytest
+
+import furi
+
+
+def test_load_json():
+    assert furi.parsers.load_json(b'{"fizz": "buzz"}') == {"fizz": "buzz"}
+    assert furi.parsers.load_json('{"fizz": "buzz"}') == {"fizz": "buzz"}
+
+
+def test_load_json_gz():
+    data = gzip.compress(json.dumps({"fizz": "buzz"}).encode("utf-8"))
+    assert furi.parsers.load_json_gz(data) == {"fizz": "buzz"}
+
+
+def test_load_yaml():
+    assert furi.parsers.load_yaml(b"fizz: buzz\njazz: [1, 2]\n") == \
+        {"fizz": "buzz", "jazz": [1, 2]}
+
+
+def test_load_yaml_safe():
+    with pytest.raises(Exception):
+        furi.parsers.load_yaml(b"!!python/object/apply:os.getcwd []")
+
+
+def test_load_toml():
+    data = b'fizz = "buzz"\n[jazz]\nfuzz = 1\n'
+    assert furi.parsers.load_toml(data) == \
+        {"fizz": "buzz", "jazz": {"fuzz": 1}}
+
+
+def test_load_ini():
+    data = b"[fizz]\nbuzz = jazz\npct = 100%\n\n[fuzz]\nx = 1\n"
+    assert furi.parsers.load_ini(data) == \
+        {"fizz": {"buzz": "jazz", "pct": "100%"}, "fuzz": {"x": "1"}}
+
+
+def test_load_env():
+    data = b'# comment\nFIZZ=buzz\nexport JAZZ="fuzz # kept"\n' \
+        b"EMPTY=\nTRAIL=value # comment\n\nnot a pair\n"
+    assert furi.parsers.load_env(data) == {
+        "FIZZ": "buzz", "JAZZ": "fuzz # kept", "EMPTY": "", "TRAIL": "value"}
+
+
+@pytest.mark.parametrize("filename,data", [
+    ("map.json.gz", gzip.compress(b'{"fizz": "buzz"}')),
+    ("map.yml", b"fizz: buzz\n"),
+    ("map.toml", b'fizz = "buzz"\n'),
+    (".env", b"fizz=buzz\n"),
+    ("prod.env", b"fizz=buzz\n")])
+def test_map_ext(tmpdir, filename, data):
+    tmpdir.join(filename).write_binary(data)
+    assert furi.map(str(tmpdir.join(filename)))["fizz"] == "buzz"
+
+
+def test_map_ext_unsupported(tmpdir):
+    tmpdir.join("map.txt").write("fizz")
+    with pytest.raises(KeyError):
+        furi.map(str(tmpdir.join("map.txt")))["fizz"]
@@ -0,0 +1,140 @@
+""" fURI Connection Pool Tests. """
+import threading
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import furi
+
+
+def test_get_cached():
+    pool = furi.pool.ConnectionPool()
+    connect = mock.Mock(side_effect=object)
+    first = pool.get("key", connect)
+    assert pool.get("key", connect) is first
+    assert connect.call_count == 1
+
+
+def test_get_unhealthy():
+    pool = furi.pool.ConnectionPool()
+    close = mock.Mock()
+    first = pool.get("key", object, close=close)
+    second = pool.get("key", object, healthy=lambda x: False, close=close)
+    assert first is not second
+    close.assert_called_once_with(first)
+
+
+def test_lru_eviction():
+    pool = furi.pool.ConnectionPool(maxsize=2)
+    close = mock.Mock()
+    first = pool.get("fizz", object, close=close)
+    pool.get("buzz", object, close=close)
+    pool.get("fizz", object, close=close)
+    pool.get("jazz", object, close=close)
+    assert "fizz" in pool
+    assert "buzz" not in pool
+    assert pool.get("fizz", object) is first
+    assert close.call_count == 1
+
+
+def test_idle_expiry():
+    pool = furi.pool.ConnectionPool(maxidle=10)
+    close = mock.Mock()
+    with mock.patch("time.time", return_value=0):
+        first = pool.get("key", object, close=close)
+    with mock.patch("time.time", return_value=20):
+        second = pool.get("key", object, close=close)
+    assert first is not second
+    close.assert_called_once_with(first)
+
+
+def test_leased_not_expired():
+    pool = furi.pool.ConnectionPool(maxidle=10)
+    close = mock.Mock()
+    with mock.patch("time.time", return_value=0):
+        first = pool.acquire("fizz", object, close=close)
+    with mock.patch("time.time", return_value=20):
+        assert pool.get("buzz", object, close=close) is not first
+        assert pool.get("fizz", object, close=close) is first
+    assert close.call_count == 0
+    with mock.patch("time.time", return_value=25):
+        pool.release("fizz", first)
+    with mock.patch("time.time", return_value=40):
+        assert pool.get("fizz", object, close=close) is not first
+    close.assert_any_call(first)
+
+
+def test_leased_not_evicted():
+    pool = furi.pool.ConnectionPool(maxsize=1)
+    close = mock.Mock()
+    first = pool.acquire("fizz", object, close=close)
+    second = pool.acquire("buzz", object, close=close)
+    assert len(pool) == 2
+    assert close.call_count == 0
+    pool.release("fizz", first)
+    pool.get("jazz", object, close=close)
+    close.assert_called_once_with(first)
+    assert "buzz" in pool
+    pool.release("buzz", second)
+
+
+def test_leased_unhealthy():
+    pool = furi.pool.ConnectionPool()
+    close = mock.Mock()
+    first = pool.acquire("key", object, close=close)
+    second = pool.get("key", object, healthy=lambda x: False, close=close)
+    assert first is not second
+    assert close.call_count == 0
+    pool.release("key", first)
+    close.assert_called_once_with(first)
+
+
+def test_close_all():
+    pool = furi.pool.ConnectionPool()
+    close = mock.Mock()
+    pool.get("fizz", object, close=close)
+    pool.get("buzz", object, close=close)
+    pool.close_all()
+    assert len(pool) == 0
+    assert close.call_count == 2
+
+
+@mock.patch("furi.furifile.RemoteFile._connect")
+def test_remote_pooled(mock_connect):
+    mock_connect.side_effect = object
+    fizz = furi.furifile.RemoteFile("sftp://user@host/fizz", password="pass")
+    buzz = furi.furifile.RemoteFile("sftp://user@host/buzz", password="pass")
+    jazz = furi.furifile.RemoteFile("sftp://user@host/jazz", password="word")
+    assert fizz.connection is buzz.connection
+    assert fizz.connection is not jazz.connection
+    furi.close_all()
+
+
+@mock.patch("furi.furifile.RemoteFile._connect")
+def test_remote_pooled_per_thread(mock_connect):
+    mock_connect.side_effect = object
+    fizz = furi.furifile.RemoteFile("sftp://user@host/fizz")
+    connections = []
+    thread = threading.Thread(target=lambda: connections.append(
+        fizz.connection))
+    thread.start()
+    thread.join()
+    assert fizz.connection is not connections[0]
+    assert fizz.connection is fizz.connection
+    fizz.close()
+    furi.close_all()
+
+
+@mock.patch("furi.furifile.RemoteFile._connect")
+def test_remote_lease(mock_connect):
+    mock_connect.side_effect = object
+    pool = furi.pool.ConnectionPool(maxsize=1)
+    with mock.patch.object(furi.furifile.RemoteFile, "__pool__", pool):
+        fizz = furi.furifile.RemoteFile("sftp://user@fizz/fizz")
+        connection = fizz.connection
+        furi.furifile.RemoteFile("sftp://user@buzz/buzz").connect()
+        assert fizz.connection is connection
+        fizz.close()
+        furi.furifile.RemoteFile("sftp://user@jazz/jazz").connect()
+        assert fizz.connection is not connection
@@ -1,4 +1,5 @@
-import json
+import errno
+import os
 try:
     from unittest import mock
 except ImportError:
@@ -43,10 +44,86 @@ def test_download_tgt_err(mock_s3):
 
 def test_extfunc():
     returned = furi.utils.extfunc('.json')
-    expected = json.loads
+    expected = furi.parsers.load_json
     assert returned == expected
 
 
+def test_extfunc_compound():
+    assert furi.utils.extfunc('.json.gz') == furi.parsers.load_json_gz
+    assert furi.utils.extfunc('.tar.json') == furi.parsers.load_json
+
+
 def test_extfunc_keyerr():
     with pytest.raises(KeyError):
         furi.utils.extfunc('buzz')
+
+
+def test_download_many_err():
+    results = furi.utils.download_many(['/path/to/local'])
+    assert results[0].status == 'failed'
+    assert results[0].target == os.path.expanduser('~/Downloads/local')
+    assert isinstance(results[0].error, furi.exceptions.DownloadError)
+
+
+def test_glob(tmpdir):
+    for path in ['2026/01/part-1.gz', '2026/01/part-2.gz', '2026/01/other.gz',
+                 '2026/02/part-1.gz', '2026/02/.part-2.gz', '2025/01/part-1.gz']:
+        tmpdir.join(path).ensure()
+    returned = furi.glob(str(tmpdir.join('2026/*/part-*.gz')))
+    expected = [str(tmpdir.join(x)) for x in [
+        '2026/01/part-1.gz', '2026/01/part-2.gz', '2026/02/part-1.gz']]
+    assert returned == expected
+
+
+def test_glob_literal(tmpdir):
+    tmpdir.join('fizz.txt').ensure()
+    assert furi.glob(str(tmpdir.join('fizz.txt'))) == \
+        [str(tmpdir.join('fizz.txt'))]
+    assert furi.glob(str(tmpdir.join('buzz.txt'))) == []
+
+
+def test_copy_local(tmpdir):
+    value = b"fizz buzz" * 1000
+    tmpdir.join("source").write_binary(value)
+    sent = []
+    returned = furi.copy(str(tmpdir.join("source")),
+                         str(tmpdir.join("sub/target")),
+                         config={"chunksize": 1024}, callback=sent.append)
+    assert tmpdir.join("sub/target").read_binary() == value
+    assert sum(sent) == len(value)
+    assert str(returned) == str(tmpdir.join("sub/target"))
+
+
+def test_copy_local_fallback(tmpdir):
+    tmpdir.join("source").write_binary(b"fizz buzz")
+    with mock.patch("os.copy_file_range", create=True,
+                    side_effect=OSError(errno.EXDEV, "cross-device")):
+        furi.copy(str(tmpdir.join("source")), str(tmpdir.join("target")))
+    assert tmpdir.join("target").read_binary() == b"fizz buzz"
+
+
+@pytest.mark.parametrize("error", [errno.ENOTSOCK, errno.EPERM])
+def test_copy_local_fallback_any_error(tmpdir, error):
+    tmpdir.join("source").write_binary(b"fizz buzz")
+    with mock.patch("os.copy_file_range", create=True,
+                    side_effect=OSError(error, "failed")):
+        furi.copy(str(tmpdir.join("source")), str(tmpdir.join("target")))
+    assert tmpdir.join("target").read_binary() == b"fizz buzz"
+
+
+def test_copy_local_empty_kernel_copy(tmpdir):
+    tmpdir.join("source").write_binary(b"fizz buzz")
+    with mock.patch("os.copy_file_range", create=True, return_value=0):
+        furi.copy(str(tmpdir.join("source")), str(tmpdir.join("target")))
+    assert tmpdir.join("target").read_binary() == b"fizz buzz"
+
+
+def test_copy_local_sendfile_linux_only(tmpdir):
+    tmpdir.join("source").write_binary(b"fizz buzz")
+    with mock.patch.object(furi.utils.os, "copy_file_range", create=True), \
+            mock.patch("sys.platform", "darwin"), \
+            mock.patch("os.sendfile", create=True) as mock_sendfile:
+        del furi.utils.os.copy_file_range
+        furi.copy(str(tmpdir.join("source")), str(tmpdir.join("target")))
+    assert tmpdir.join("target").read_binary() == b"fizz buzz"
+    assert mock_sendfile.call_count == 0